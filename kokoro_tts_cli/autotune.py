@@ -0,0 +1,172 @@
+import os
+import sys
+import json
+import time
+import torch
+import argparse
+import platform
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+DEFAULT_CACHE = Path.home() / '.cache' / 'kokoro-tts-cli' / 'autotune.json'
+
+# Long enough to give several model calls per measurement
+BENCHMARK_TEXT = (
+    "The quick brown fox jumps over the lazy dog while the morning sun rises "
+    "slowly over the quiet hills. Nobody in the village had expected the "
+    "storm to pass so quickly, and by noon the streets were full again."
+)
+
+def machine_key(mode: str, cores: int) -> str:
+    """Identify a tuning result; a shared home directory may serve several hosts."""
+    return f"{platform.node()}/{platform.machine()}/{cores} cores/torch {torch.__version__}/{mode}"
+
+def candidate_configs(cores: int, streams: Optional[int] = None,
+                      workers: int = 1) -> List[Tuple[int, int]]:
+    """(streams, threads per stream) pairs that do not oversubscribe `cores`.
+
+    Each stream is a process running `workers` syntheses at once, and each
+    of those uses the stream's torch threads. With a fixed number of
+    streams only the thread count varies.
+    """
+    def powers(limit):
+        value = 1
+        while value < limit:
+            yield value
+            value *= 2
+        yield limit
+
+    if streams is not None:
+        limit = max(1, cores // (streams * workers))
+        return [(streams, threads) for threads in powers(limit)]
+    return [(count, max(1, cores // (count * workers)))
+            for count in powers(max(1, cores // workers))]
+
+def _run_stream(run_chunk: Callable[[], float], threads: int, workers: int,
+                duration: float, fd: int):
+    """Child process body: synthesize for `duration` seconds and report the rate."""
+    status = 1
+    try:
+        torch.set_num_threads(threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass  # Only settable before the first parallel work
+        run_chunk()  # Warm up
+        produced = [0.0] * workers
+
+        def loop(index):
+            while time.perf_counter() - start < duration:
+                produced[index] += run_chunk()
+
+        # Like a server process, run `workers` syntheses concurrently
+        start = time.perf_counter()
+        loops = [threading.Thread(target=loop, args=(i,)) for i in range(workers)]
+        for thread in loops:
+            thread.start()
+        for thread in loops:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        os.write(fd, json.dumps({'rtf': sum(produced) / elapsed}).encode('utf-8'))
+        status = 0
+    finally:
+        os._exit(status)
+
+def measure(run_chunk: Callable[[], float], streams: int, threads: int,
+            duration: float = 5.0, workers: int = 1) -> float:
+    """Aggregate real-time factor of `streams` forked processes synthesizing at once."""
+    children = []
+    for _ in range(streams):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            _run_stream(run_chunk, threads, workers, duration, write_fd)
+        os.close(write_fd)
+        children.append((pid, read_fd))
+
+    total = 0.0
+    for pid, read_fd in children:
+        with os.fdopen(read_fd, 'rb') as f:
+            data = f.read()
+        _, status = os.waitpid(pid, 0)
+        if status != 0 or not data:
+            raise RuntimeError(f"Benchmark process exited with status {status}")
+        total += json.loads(data)['rtf']
+    return total
+
+def autotune(run_chunk: Callable[[], float], mode: str, streams: Optional[int] = None,
+             workers: int = 1, cores: Optional[int] = None, duration: float = 5.0,
+             cache_path: Path = DEFAULT_CACHE, refresh: bool = False) -> dict:
+    """Find the (streams, threads) configuration with the highest aggregate RTF.
+
+    `run_chunk` synthesizes one benchmark chunk and returns the seconds of
+    audio produced; each stream runs it from `workers` threads at once.
+    Results are stored in `cache_path` per machine and mode and reused
+    unless `refresh` is set.
+    """
+    cores = cores or os.cpu_count() or 1
+    if streams is not None:
+        mode = f'{mode}-{streams}'
+    key = machine_key(f'{mode}/{workers} workers', cores)
+    try:
+        cache = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    if key in cache and not refresh:
+        return dict(cache[key], cached=True)
+
+    if not hasattr(os, 'fork'):
+        raise RuntimeError("--autotune requires a platform with fork()")
+
+    results = []
+    for count, threads in candidate_configs(cores, streams, workers):
+        rtf = measure(run_chunk, count, threads, duration, workers)
+        print(f"Autotune: {count} x {workers} workers x {threads} threads -> "
+              f"{rtf:.2f}x real time", file=sys.stderr)
+        results.append({'streams': count, 'workers': workers, 'threads': threads,
+                        'rtf': round(rtf, 3)})
+
+    # Measurements are noisy: among configurations within 3% of the fastest,
+    # take the first, i.e. the one with fewer processes or threads
+    fastest = max(result['rtf'] for result in results)
+    best = next(result for result in results if result['rtf'] >= 0.97 * fastest)
+    tuning = dict(best, measured=time.time(), results=results)
+    cache[key] = tuning
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(cache, indent=2))
+        os.replace(tmp, cache_path)
+    except OSError as e:
+        print(f"Warning: could not save autotune results to {cache_path}: {e}", file=sys.stderr)
+    return dict(tuning, cached=False)
+
+def describe(tuning: dict) -> str:
+    source = 'cached' if tuning.get('cached') else 'measured'
+    return (f"{tuning['streams']} x {tuning.get('workers', 1)} workers x "
+            f"{tuning['threads']} threads, "
+            f"{tuning['rtf']:.2f}x real time ({source})")
+
+def record_tuning(registry, tuning: dict):
+    """Expose the chosen configuration as metrics gauges."""
+    registry.gauge(
+        'kokoro_torch_threads', 'Torch intra-op threads per process chosen by autotuning'
+    ).set(tuning['threads'])
+    registry.gauge(
+        'kokoro_autotune_streams', 'Concurrent synthesis processes chosen by autotuning'
+    ).set(tuning['streams'])
+    registry.gauge(
+        'kokoro_autotune_realtime_factor', 'Aggregate real-time factor measured by autotuning'
+    ).set(tuning['rtf'])
+
+def add_autotune_arguments(parser: argparse.ArgumentParser):
+    """Add the --autotune family of options to a command line parser."""
+    parser.add_argument('--autotune', action='store_true',
+                      help='Benchmark thread settings on first use and apply the fastest '
+                           '(results are cached per machine)')
+    parser.add_argument('--autotune-refresh', action='store_true',
+                      help='Re-run the autotuning benchmark even if a cached result exists')
+    parser.add_argument('--autotune-seconds', type=float, default=5.0,
+                      help='Benchmark time per configuration (default: 5)')
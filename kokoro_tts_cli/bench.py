@@ -0,0 +1,381 @@
+import re
+import sys
+import math
+import time
+import json
+import random
+import socket
+import argparse
+import threading
+from typing import Dict, List, Optional
+from .codec import recv_frame, recv_header
+from .profiling import add_profile_arguments, profiler_from_args
+
+SIZE_CLASSES = {
+    'short': 1,    # sentences per request
+    'medium': 3,
+    'long': 8,
+}
+
+def load_corpus(lines: List[str]) -> List[str]:
+    """Split a text corpus into sentences to draw requests from."""
+    text = ' '.join(line.strip() for line in lines if line.strip())
+    sentences = re.split(r'(?<=[.!?])\s+', text)
+    return [s.strip() for s in sentences if s.strip()]
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse a size mix specification like "short:0.6,medium:0.3,long:0.1"."""
+    mix = {}
+    for part in spec.split(','):
+        name, weight = part.split(':')
+        if name not in SIZE_CLASSES:
+            raise ValueError(
+                f"Unknown size class '{name}' (choose from {', '.join(SIZE_CLASSES)})"
+            )
+        mix[name] = float(weight)
+    if sum(mix.values()) <= 0:
+        raise ValueError("Size mix weights must sum to a positive value")
+    return mix
+
+def send_request(host: str, port: int, request: dict, timeout: float = 300.0) -> dict:
+    """Issue one synthesis request and time the response.
+
+    Returns a record with time to first audio byte (ttfa), total latency
+    and bytes received. Errors are recorded rather than raised.
+    """
+    record = {'ttfa': None, 'latency': None, 'bytes': 0, 'error': None}
+    start = time.perf_counter()
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            sock.sendall(json.dumps(request).encode('utf-8'))
+            if request.get('encoding'):
+                recv_header(sock)
+                while True:
+                    frame = recv_frame(sock)
+                    if frame is None:
+                        raise ConnectionError("stream truncated")
+                    if not frame:
+                        break
+                    if record['ttfa'] is None:
+                        record['ttfa'] = time.perf_counter() - start
+                    record['bytes'] += len(frame)
+            else:
+                while True:
+                    data = sock.recv(65536)
+                    if not data:
+                        break
+                    if record['ttfa'] is None:
+                        record['ttfa'] = time.perf_counter() - start
+                    record['bytes'] += len(data)
+        record['latency'] = time.perf_counter() - start
+        if record['bytes'] == 0:
+            record['error'] = 'empty response'
+    except Exception as e:
+        record['latency'] = time.perf_counter() - start
+        record['error'] = f"{type(e).__name__}: {e}"
+    return record
+
+class LoadGenerator:
+    """Replay a text corpus against a running kokoro-tts-server.
+
+    In closed-loop mode (no rate given) `concurrency` workers issue
+    requests back to back. In open-loop mode requests arrive as a Poisson
+    process at `rate` requests per second regardless of how fast the
+    server answers; at most `concurrency` requests are in flight and the
+    time an arrival waits for a free slot counts towards its latency.
+    """
+
+    def __init__(self, host: str, port: int, sentences: List[str],
+                 voice: str = 'af', speed: float = 1.0, encoding: Optional[str] = None,
+                 concurrency: int = 4, rate: Optional[float] = None,
+                 mix: Optional[Dict[str, float]] = None, seed: Optional[int] = None):
+        if not sentences:
+            raise ValueError("Corpus is empty")
+        self.host = host
+        self.port = port
+        self.sentences = sentences
+        self.voice = voice
+        self.speed = speed
+        self.encoding = encoding
+        self.concurrency = concurrency
+        self.rate = rate
+        self.mix = mix or {'short': 1.0}
+        self.rng = random.Random(seed)
+        self.records = []
+        self.lock = threading.Lock()
+        self.slots = threading.Semaphore(concurrency)
+
+    def make_request(self) -> dict:
+        with self.lock:
+            size = self.rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+            count = SIZE_CLASSES[size]
+            start = self.rng.randrange(len(self.sentences))
+        picked = [self.sentences[(start + i) % len(self.sentences)] for i in range(count)]
+        request = {
+            'text': ' '.join(picked),
+            'voice': self.voice,
+            'speed': self.speed,
+        }
+        if self.encoding:
+            request['encoding'] = self.encoding
+        return {'size': size, 'request': request}
+
+    def run_one(self, job: dict, scheduled: float):
+        record = send_request(self.host, self.port, job['request'])
+        # Charge time spent waiting for a slot to the request (open-loop)
+        wait = time.perf_counter() - scheduled - record['latency']
+        record['queue_wait'] = max(0.0, wait)
+        if record['ttfa'] is not None:
+            record['ttfa'] += record['queue_wait']
+        record['latency'] += record['queue_wait']
+        record['size'] = job['size']
+        record['chars'] = len(job['request']['text'])
+        record['started'] = scheduled
+        with self.lock:
+            self.records.append(record)
+
+    def _closed_loop_worker(self, deadline: float, remaining: List[int]):
+        while time.perf_counter() < deadline:
+            with self.lock:
+                if remaining[0] == 0:
+                    return
+                remaining[0] -= 1
+            self.run_one(self.make_request(), time.perf_counter())
+
+    def _open_loop_task(self, job: dict, scheduled: float):
+        try:
+            self.run_one(job, scheduled)
+        finally:
+            self.slots.release()
+
+    def run(self, duration: float = 60.0, max_requests: Optional[int] = None,
+            report_interval: Optional[float] = None) -> List[dict]:
+        deadline = time.perf_counter() + duration
+        threads = []
+        reporter = None
+        stop_reporting = threading.Event()
+
+        if report_interval:
+            reporter = threading.Thread(
+                target=self._report_loop,
+                args=(report_interval, stop_reporting),
+                daemon=True
+            )
+            reporter.start()
+
+        if self.rate is None:
+            remaining = [max_requests if max_requests is not None else -1]
+            for _ in range(self.concurrency):
+                thread = threading.Thread(
+                    target=self._closed_loop_worker,
+                    args=(deadline, remaining)
+                )
+                thread.start()
+                threads.append(thread)
+        else:
+            issued = 0
+            next_arrival = time.perf_counter()
+            while next_arrival < deadline:
+                if max_requests is not None and issued >= max_requests:
+                    break
+                delay = next_arrival - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                job = self.make_request()
+                self.slots.acquire()
+                thread = threading.Thread(
+                    target=self._open_loop_task,
+                    args=(job, next_arrival)
+                )
+                thread.start()
+                threads.append(thread)
+                issued += 1
+                next_arrival += self.rng.expovariate(self.rate)
+
+        for thread in threads:
+            thread.join()
+
+        stop_reporting.set()
+        if reporter:
+            reporter.join()
+        return self.records
+
+    def _report_loop(self, interval: float, stop: threading.Event):
+        while not stop.wait(interval):
+            with self.lock:
+                done = len(self.records)
+                errors = sum(1 for r in self.records if r['error'])
+            print(f"[bench] {done} requests completed, {errors} errors", file=sys.stderr)
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(math.ceil(q / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+def format_histogram(values: List[float], title: str, width: int = 40) -> str:
+    """Render a log-scale latency histogram as text."""
+    lines = [title]
+    if not values:
+        lines.append("  (no samples)")
+        return '\n'.join(lines)
+
+    # Bucket upper bounds in seconds: 10ms, 20ms, 50ms, 100ms, ...
+    bounds = []
+    base = 0.01
+    while not bounds or bounds[-1] < max(values):
+        for step in (1, 2, 5):
+            bounds.append(base * step)
+        base *= 10
+    counts = [0] * len(bounds)
+    for value in values:
+        for i, bound in enumerate(bounds):
+            if value <= bound:
+                counts[i] += 1
+                break
+
+    # Drop empty buckets at both ends
+    first = next(i for i, c in enumerate(counts) if c)
+    last = max(i for i, c in enumerate(counts) if c)
+    peak = max(counts)
+    for bound, count in zip(bounds[first:last + 1], counts[first:last + 1]):
+        bar = '#' * int(round(width * count / peak))
+        lines.append(f"  <= {bound * 1000:>8.0f} ms | {bar:<{width}} {count}")
+
+    lines.append(
+        "  p50 {:.0f} ms  p90 {:.0f} ms  p99 {:.0f} ms  max {:.0f} ms".format(
+            percentile(values, 50) * 1000,
+            percentile(values, 90) * 1000,
+            percentile(values, 99) * 1000,
+            max(values) * 1000,
+        )
+    )
+    return '\n'.join(lines)
+
+def summarize(records: List[dict], elapsed: float) -> str:
+    ok = [r for r in records if not r['error']]
+    errors = [r for r in records if r['error']]
+    total_bytes = sum(r['bytes'] for r in records)
+
+    lines = [
+        "",
+        "Kokoro TTS Load Test Results",
+        "============================",
+        f"Requests:    {len(records)} ({len(ok)} ok, {len(errors)} errors)",
+        f"Duration:    {elapsed:.1f} s",
+        f"Throughput:  {len(ok) / elapsed if elapsed > 0 else 0:.2f} req/s",
+        f"Received:    {total_bytes / 1e6:.1f} MB",
+        "",
+        format_histogram([r['ttfa'] for r in ok if r['ttfa'] is not None],
+                         "Time to first audio (TTFA):"),
+        "",
+        format_histogram([r['latency'] for r in ok], "Total latency:"),
+    ]
+
+    for size in SIZE_CLASSES:
+        sized = [r['latency'] for r in ok if r['size'] == size]
+        if sized:
+            lines.append(
+                f"  {size:<7} n={len(sized):<5} p50 {percentile(sized, 50) * 1000:.0f} ms"
+                f"  p99 {percentile(sized, 99) * 1000:.0f} ms"
+            )
+
+    if errors:
+        kinds = {}
+        for r in errors:
+            kinds[r['error']] = kinds.get(r['error'], 0) + 1
+        lines.append("")
+        lines.append("Errors:")
+        for kind, count in sorted(kinds.items(), key=lambda x: -x[1]):
+            lines.append(f"  {count:>5}  {kind}")
+
+    return '\n'.join(lines)
+
+def run_bench():
+    """Entry point for the load testing tool."""
+    parser = argparse.ArgumentParser(description='Kokoro TTS Server Load Generator')
+    parser.add_argument('corpus', nargs='?',
+                      help='Text file to draw requests from (default: stdin)')
+    parser.add_argument('--host', default='localhost',
+                      help='Server host (default: localhost)')
+    parser.add_argument('--port', type=int, default=5000,
+                      help='Server port (default: 5000)')
+    parser.add_argument('--voice', default='af',
+                      help='Voice or mix specification to request')
+    parser.add_argument('--speed', type=float, default=1.0,
+                      help='Speech speed multiplier to request')
+    parser.add_argument('--encoding', choices=['float32', 'int16', 'mulaw', 'raw'], default='raw',
+                      help='Audio encoding to request (default: raw legacy float32 stream)')
+    parser.add_argument('--concurrency', '-c', type=int, default=4,
+                      help='Maximum requests in flight (default: 4)')
+    parser.add_argument('--rate', type=float,
+                      help='Open-loop Poisson arrival rate in requests/s '
+                           '(default: closed loop, back-to-back requests)')
+    parser.add_argument('--mix', default='short:0.6,medium:0.3,long:0.1',
+                      help='Request size mix (default: "short:0.6,medium:0.3,long:0.1")')
+    parser.add_argument('--duration', type=float, default=60.0,
+                      help='Test duration in seconds (default: 60)')
+    parser.add_argument('--requests', '-n', type=int,
+                      help='Stop after this many requests')
+    parser.add_argument('--report-interval', type=float, default=10.0,
+                      help='Seconds between progress lines, 0 to disable (default: 10)')
+    parser.add_argument('--output', '-o', type=str,
+                      help='Write per-request records as JSON lines')
+    parser.add_argument('--seed', type=int,
+                      help='Random seed for reproducible runs')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    profiler = profiler_from_args(args)
+    if profiler:
+        profiler.install(sys.modules[__name__], ['send_request'], requests=['send_request'])
+
+    try:
+        if args.corpus:
+            with open(args.corpus, encoding='utf-8') as f:
+                sentences = load_corpus(f.readlines())
+        else:
+            sentences = load_corpus(sys.stdin.readlines())
+
+        generator = LoadGenerator(
+            args.host, args.port, sentences,
+            voice=args.voice,
+            speed=args.speed,
+            encoding=None if args.encoding == 'raw' else args.encoding,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            mix=parse_mix(args.mix),
+            seed=args.seed
+        )
+
+        print(f"Running load test against {args.host}:{args.port} "
+              f"({'open loop at %.2f req/s' % args.rate if args.rate else 'closed loop'}, "
+              f"concurrency {args.concurrency})", file=sys.stderr)
+        start = time.perf_counter()
+        records = generator.run(
+            duration=args.duration,
+            max_requests=args.requests,
+            report_interval=args.report_interval or None
+        )
+        elapsed = time.perf_counter() - start
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record) + '\n')
+
+        print(summarize(records, elapsed))
+
+    except KeyboardInterrupt:
+        print("\nInterrupted by user", file=sys.stderr)
+        sys.exit(0)
+    except Exception as e:
+        print(f"\nError: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if profiler:
+            profiler.stop()
+
+if __name__ == "__main__":
+    run_bench()
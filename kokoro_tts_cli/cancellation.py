@@ -0,0 +1,57 @@
+import select
+import socket
+import threading
+from typing import Callable
+
+class CancelledError(Exception):
+    """Raised when work is abandoned because its token was cancelled."""
+
+class CancellationToken:
+    """Cooperative cancellation flag checked between units of work.
+
+    A token is cancelled explicitly with `cancel()` or implicitly when one
+    of its checks (e.g. "has the client hung up?") returns True.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._checks = []  # (check, reason) pairs
+        self.reason = None
+
+    def cancel(self, reason: str = 'cancelled'):
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    def add_check(self, check: Callable[[], bool], reason: str = 'cancelled'):
+        self._checks.append((check, reason))
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        for check, reason in self._checks:
+            if check():
+                self.cancel(reason)
+                return True
+        return False
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise CancelledError(self.reason)
+
+def socket_closed(sock: socket.socket) -> bool:
+    """Check without blocking whether the peer has dropped the connection.
+
+    End of stream alone does not count: a client may shut down its sending
+    side once the request is out (e.g. `nc -N`) and still read the whole
+    response. A client that really went away resets the connection as soon
+    as something is sent to it, which this check or the send then reports.
+    """
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+        if readable:
+            sock.recv(1, socket.MSG_PEEK)
+        return False
+    except (OSError, ValueError):
+        return True
@@ -1,14 +1,25 @@
 import socket
 import json
 import numpy as np
-from typing import Optional, Iterator
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Iterator, Iterable, List, Tuple
 import sys
 import re
+from .codec import SAMPLE_RATE, decode_audio, recv_frame, recv_header
+from .sharding import Endpoint, HashRing
+
+# Characters of text per sharded request; roughly the server's 450-token
+# chunk limit, so each request is about one forward pass
+SHARD_CHARS = 400
 
 class KokoroTTSClient:
-    def __init__(self, host: str = 'localhost', port: int = 5000):
+    def __init__(self, host: str = 'localhost', port: int = 5000,
+                 servers: Optional[List[Endpoint]] = None, parallel: int = 4):
         self.host = host
         self.port = port
+        self.ring = HashRing(servers) if servers else None
+        self.parallel = parallel
         
     def process_chunks(self, text_iterator: Iterator[str]) -> Iterator[str]:
         """Process text into meaningful chunks (sentences/paragraphs)."""
@@ -31,10 +42,27 @@ class KokoroTTSClient:
         if buffer.strip():
             yield buffer.strip()
 
+    def group_chunks(self, sentences: Iterable[str], max_chars: int = SHARD_CHARS) -> Iterator[str]:
+        """Join consecutive sentences into requests of up to `max_chars` characters."""
+        group = ''
+        for sentence in sentences:
+            if group and len(group) + 1 + len(sentence) > max_chars:
+                yield group
+                group = ''
+            group = f'{group} {sentence}' if group else sentence
+        if group:
+            yield group
+
     def synthesize(self, text: str, voice: str = 'af', speed: float = 1.0,
                   save_path: Optional[str] = None, play_audio: bool = True,
-                  output_raw: bool = False, verbose: bool = False):
-        """Process a single chunk of text."""
+                  output_raw: bool = False, verbose: bool = False,
+                  encoding: Optional[str] = 'int16'):
+        """Process a single chunk of text.
+
+        With an `encoding` the server streams framed audio in that format
+        and playback starts with the first chunk; without one the server
+        sends raw float32 samples.
+        """
         if not text.strip():
             return
             
@@ -51,6 +79,8 @@ class KokoroTTSClient:
                     'speed': speed,
                     'save_path': save_path
                 }
+                if encoding:
+                    request['encoding'] = encoding
                 
                 if verbose:
                     print(f"Processing chunk: {text[:50]}...", file=sys.stderr)
@@ -59,6 +89,32 @@ class KokoroTTSClient:
                 request_data = json.dumps(request).encode('utf-8')
                 client_socket.sendall(request_data)
                 
+                from .streamer import AudioStreamer
+
+                if encoding:
+                    header = recv_header(client_socket)
+                    if verbose:
+                        print(f"Receiving {header['encoding']} audio at {header['sample_rate']} Hz",
+                              file=sys.stderr)
+                    streamer = AudioStreamer(
+                        sample_rate=header['sample_rate'],
+                        save_path=save_path,
+                        play_audio=play_audio,
+                        output_raw=output_raw
+                    )
+                    streamer.speed_multiplier = speed
+
+                    # Play each chunk as soon as it arrives
+                    while True:
+                        frame = recv_frame(client_socket)
+                        if frame is None:
+                            raise ConnectionError("Connection closed before the end of the stream")
+                        if not frame:
+                            break
+                        streamer.play_audio(decode_audio(frame, header['encoding']))
+                    streamer.wait_until_done()
+                    return
+
                 # Receive response data
                 response_data = b''
                 while True:
@@ -68,8 +124,6 @@ class KokoroTTSClient:
                     response_data += chunk
                 
                 try:
-                    from .streamer import AudioStreamer
-                    
                     # Process audio data
                     audio = np.frombuffer(response_data, dtype=np.float32)
                     
@@ -92,6 +146,142 @@ class KokoroTTSClient:
             if verbose:
                 print(f"Error in synthesize: {str(e)}", file=sys.stderr)
 
+    def fetch_audio(self, text: str, voice: str = 'af', speed: float = 1.0,
+                    encoding: Optional[str] = 'int16',
+                    endpoint: Optional[Endpoint] = None) -> Tuple[int, np.ndarray]:
+        """Render text on one server and return (sample_rate, audio)."""
+        host, port = endpoint or (self.host, self.port)
+        request = {'text': text, 'voice': voice, 'speed': speed}
+        if encoding:
+            request['encoding'] = encoding
+
+        with socket.create_connection((host, port)) as client_socket:
+            client_socket.sendall(json.dumps(request).encode('utf-8'))
+            if not encoding:
+                response_data = b''
+                while True:
+                    chunk = client_socket.recv(65536)
+                    if not chunk:
+                        break
+                    response_data += chunk
+                return SAMPLE_RATE, np.frombuffer(response_data, dtype=np.float32)
+
+            header = recv_header(client_socket)
+            frames = []
+            while True:
+                frame = recv_frame(client_socket)
+                if frame is None:
+                    raise ConnectionError("Connection closed before the end of the stream")
+                if not frame:
+                    break
+                frames.append(frame)
+            return header['sample_rate'], decode_audio(b''.join(frames), header['encoding'])
+
+    def _call(self, request: dict) -> dict:
+        """Send a job request and return the server's JSON reply."""
+        with socket.create_connection((self.host, self.port)) as client_socket:
+            client_socket.sendall(json.dumps(request).encode('utf-8'))
+            return recv_header(client_socket)
+
+    def submit_job(self, text: str, voice: str = 'af', speed: float = 1.0) -> dict:
+        """Queue text for rendering on the server and return the new job's status."""
+        return self._call({'op': 'submit', 'text': text, 'voice': voice, 'speed': speed})
+
+    def job_status(self, job_id: str) -> dict:
+        return self._call({'op': 'status', 'job_id': job_id})
+
+    def cancel_job(self, job_id: str) -> dict:
+        return self._call({'op': 'cancel', 'job_id': job_id})
+
+    def fetch_job(self, job_id: str, save_path: Optional[str] = None, play_audio: bool = True,
+                  output_raw: bool = False, verbose: bool = False,
+                  encoding: Optional[str] = 'int16'):
+        """Stream a job's audio; a job still rendering is followed until it ends."""
+        from .streamer import AudioStreamer
+
+        request = {'op': 'fetch', 'job_id': job_id, 'encoding': encoding or 'int16'}
+        with socket.create_connection((self.host, self.port)) as client_socket:
+            client_socket.sendall(json.dumps(request).encode('utf-8'))
+            header = recv_header(client_socket)
+            if verbose:
+                print(f"Receiving job {job_id} as {header['encoding']} audio at "
+                      f"{header['sample_rate']} Hz", file=sys.stderr)
+            streamer = AudioStreamer(
+                sample_rate=header['sample_rate'],
+                save_path=save_path,
+                play_audio=play_audio,
+                output_raw=output_raw
+            )
+            while True:
+                frame = recv_frame(client_socket)
+                if frame is None:
+                    raise ConnectionError("Connection closed before the end of the job's audio")
+                if not frame:
+                    break
+                streamer.play_audio(decode_audio(frame, header['encoding']))
+            streamer.wait_until_done()
+
+    def fetch_sharded(self, text: str, voice: str = 'af', speed: float = 1.0,
+                      encoding: Optional[str] = 'int16', verbose: bool = False) -> Tuple[int, np.ndarray]:
+        """Render text on the server that owns it, failing over along the ring."""
+        key = json.dumps([text, voice, speed, encoding])
+        last_error = None
+        for endpoint in self.ring.nodes_for(key):
+            try:
+                return self.fetch_audio(text, voice, speed, encoding, endpoint)
+            except OSError as e:
+                last_error = e
+                if verbose:
+                    print(f"Server {endpoint[0]}:{endpoint[1]} failed ({e}), trying next",
+                          file=sys.stderr)
+        raise ConnectionError(f"All servers failed, last error: {last_error}")
+
+    def synthesize_sharded(self, texts: Iterable[str], voice: str = 'af', speed: float = 1.0,
+                           save_path: Optional[str] = None, play_audio: bool = True,
+                           output_raw: bool = False, verbose: bool = False,
+                           encoding: Optional[str] = 'int16'):
+        """Render chunks on several servers in parallel and play them in order.
+
+        Each chunk goes to the server chosen by consistent hashing on its
+        text and parameters, so repeated text hits the same server's warm
+        caches. Up to `parallel` chunks are in flight at once.
+        """
+        from .streamer import AudioStreamer
+
+        streamer = None
+        pending = deque()
+
+        def play_next():
+            nonlocal streamer
+            sample_rate, audio = pending.popleft().result()
+            if streamer is None:
+                streamer = AudioStreamer(
+                    sample_rate=sample_rate,
+                    save_path=save_path,
+                    play_audio=play_audio,
+                    output_raw=output_raw
+                )
+                streamer.speed_multiplier = speed
+            if len(audio) > 0:
+                streamer.play_audio(audio)
+
+        with ThreadPoolExecutor(max_workers=self.parallel) as pool:
+            for text in texts:
+                if not text.strip():
+                    continue
+                if verbose:
+                    print(f"Processing chunk: {text[:50]}...", file=sys.stderr)
+                pending.append(pool.submit(
+                    self.fetch_sharded, text, voice, speed, encoding, verbose
+                ))
+                while len(pending) >= self.parallel:
+                    play_next()
+            while pending:
+                play_next()
+
+        if streamer is not None:
+            streamer.wait_until_done()
+
     def process_stream(self, input_stream=sys.stdin, **kwargs):
         """Process input stream in chunks."""
         def text_generator():
@@ -101,5 +291,9 @@ class KokoroTTSClient:
                     break
                 yield chunk
 
+        if self.ring:
+            self.synthesize_sharded(self.process_chunks(text_generator()), **kwargs)
+            return
+
         for sentence in self.process_chunks(text_generator()):
             self.synthesize(sentence, **kwargs)
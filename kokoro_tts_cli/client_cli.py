@@ -1,6 +1,7 @@
 import sys
 import argparse
 from .client import KokoroTTSClient
+from .sharding import parse_endpoints
 from .streamer import show_usage_guide
 
 def run_client():
@@ -24,6 +25,23 @@ def run_client():
                       help='Server host (default: localhost)')
     parser.add_argument('--port', type=int, default=5000,
                       help='Server port (default: 5000)')
+    parser.add_argument('--servers', type=str,
+                      help='Comma-separated host:port list; chunks are spread over the servers '
+                           'by consistent hashing and rendered in parallel')
+    parser.add_argument('--parallel', type=int, default=4,
+                      help='Chunks in flight at once with --servers (default: 4)')
+    parser.add_argument('--encoding', choices=['float32', 'int16', 'mulaw', 'raw'], default='int16',
+                      help='Audio encoding requested from the server: int16 (default), float32, '
+                           'mulaw (8 kHz telephony) or raw (legacy unframed float32)')
+    jobs = parser.add_mutually_exclusive_group()
+    jobs.add_argument('--submit', action='store_true',
+                      help='Queue the input as a background job on the server and print its ID')
+    jobs.add_argument('--status', metavar='JOB_ID',
+                      help='Show the progress of a background job')
+    jobs.add_argument('--fetch', metavar='JOB_ID',
+                      help='Play or save the audio of a background job, following it while it renders')
+    jobs.add_argument('--cancel', metavar='JOB_ID',
+                      help='Cancel a background job')
     parser.add_argument('--batch', action='store_true',
                       help='Process entire input at once (faster for wav generation, no streaming)')
     parser.add_argument('--help-guide', action='store_true',
@@ -35,9 +53,52 @@ def run_client():
         return
 
     try:
-        client = KokoroTTSClient(host=args.host, port=args.port)
+        client = KokoroTTSClient(
+            host=args.host,
+            port=args.port,
+            servers=parse_endpoints(args.servers, args.port) if args.servers else None,
+            parallel=args.parallel
+        )
+        encoding = None if args.encoding == 'raw' else args.encoding
         
-        if args.batch:
+        if args.submit:
+            job = client.submit_job(sys.stdin.read(), voice=args.voice, speed=args.speed)
+            print(job['job_id'])
+        elif args.status or args.cancel:
+            if args.status:
+                job = client.job_status(args.status)
+            else:
+                job = client.cancel_job(args.cancel)
+            progress = f"{job['chunks_done']}/{job['chunks_total']} chunks"
+            print(f"{job['job_id']}: {job['status']}, {progress}, "
+                  f"{job['audio_seconds']:.1f}s of audio"
+                  + (f" ({job['message']})" if job['message'] else ''))
+        elif args.fetch:
+            client.fetch_job(
+                args.fetch,
+                save_path=args.save,
+                play_audio=args.play,
+                output_raw=args.output_raw,
+                verbose=args.verbose,
+                encoding=encoding
+            )
+        elif args.batch and client.ring:
+            # Split locally so the document is rendered on all servers at once,
+            # grouping sentences so each request fills a model chunk
+            text = sys.stdin.read()
+            if args.verbose:
+                print(f"Rendering on {len(client.ring.endpoints)} servers...", file=sys.stderr)
+            client.synthesize_sharded(
+                client.group_chunks(client.process_chunks([text])),
+                voice=args.voice,
+                speed=args.speed,
+                save_path=args.save,
+                play_audio=args.play,
+                output_raw=args.output_raw,
+                verbose=args.verbose,
+                encoding=encoding
+            )
+        elif args.batch:
             # Read entire input at once
             text = sys.stdin.read()
             if args.verbose:
@@ -49,7 +110,8 @@ def run_client():
                 save_path=args.save,
                 play_audio=args.play,
                 output_raw=args.output_raw,
-                verbose=args.verbose
+                verbose=args.verbose,
+                encoding=encoding
             )
         else:
             # Streaming mode
@@ -64,7 +126,8 @@ def run_client():
                 save_path=args.save,
                 play_audio=args.play,
                 output_raw=args.output_raw,
-                verbose=args.verbose
+                verbose=args.verbose,
+                encoding=encoding
             )
         
     except ConnectionRefusedError:
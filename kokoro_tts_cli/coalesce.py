@@ -0,0 +1,59 @@
+import threading
+from typing import Callable, Hashable, Optional, Tuple
+from .cancellation import CancellationToken
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for and share its result (or its exception). Nothing
+    is kept once the call finishes, so this is not a cache.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key: Hashable, fn: Callable, token: Optional[CancellationToken] = None) -> Tuple[object, bool]:
+        """Return `(result, shared)` where `shared` is True for waiters."""
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+
+        if not leader:
+            # Waiters stay responsive to their own cancellation
+            while not call.done.wait(0.1):
+                if token is not None:
+                    token.raise_if_cancelled()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+        return call.result, False
+
+def voice_key(voice_spec: str) -> Tuple[Tuple[str, float], ...]:
+    """Normalize a voice or mix specification so equivalent mixes compare equal."""
+    if ':' not in voice_spec:
+        return ((voice_spec, 1.0),)
+    parts = []
+    for part in voice_spec.split(','):
+        name, weight = part.split(':')
+        parts.append((name.strip(), float(weight)))
+    return tuple(sorted(parts))
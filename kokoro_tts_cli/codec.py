@@ -0,0 +1,187 @@
+import json
+import socket
+import struct
+import numpy as np
+from typing import Optional
+
+# Wire protocol
+# -------------
+# A request may name an `encoding`. Without one the server streams raw
+# float32 samples at 24 kHz until it closes the connection, as before.
+# With one, the response is a sequence of frames, each a 4-byte big-endian
+# length followed by that many bytes:
+#
+#   1. a JSON header: {"sample_rate": ..., "encoding": ..., "channels": 1}
+#      or {"error": "..."} if the request could not be served
+#   2. one frame of encoded audio per synthesized chunk
+#   3. an empty frame marking the end of the stream
+
+SAMPLE_RATE = 24000
+
+ENCODINGS = {
+    # name: (bytes per sample, output sample rate or None to keep the model rate)
+    'float32': (4, None),
+    'int16': (2, None),
+    'mulaw': (1, 8000),
+}
+
+MAX_HEADER_SIZE = 65536
+
+def output_sample_rate(encoding: str, source_rate: int = SAMPLE_RATE) -> int:
+    """Sample rate of audio sent with `encoding`."""
+    return ENCODINGS[encoding][1] or source_rate
+
+def resample(audio: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """Resample with a polyphase filter (e.g. 24 kHz to 8 kHz for telephony)."""
+    if source_rate == target_rate:
+        return audio
+    from math import gcd
+    from scipy.signal import resample_poly
+    divisor = gcd(source_rate, target_rate)
+    return resample_poly(audio, target_rate // divisor, source_rate // divisor).astype(np.float32)
+
+class StreamResampler:
+    """Polyphase resampler that keeps its filter state between calls.
+
+    Resampling each frame of a stream on its own restarts the filter at
+    every frame boundary, which clicks. Feeding the frames through one
+    instance and calling `flush()` at the end gives the same samples as
+    `resample` on the whole signal.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int):
+        from math import gcd
+        from scipy.signal import firwin
+        divisor = gcd(source_rate, target_rate)
+        self.up = target_rate // divisor
+        self.down = source_rate // divisor
+        # The low-pass filter resample_poly designs by default
+        max_rate = max(self.up, self.down)
+        self.half_len = 10 * max_rate
+        self.taps = firwin(2 * self.half_len + 1, 1.0 / max_rate,
+                           window=('kaiser', 5.0)) * self.up
+        self.state = np.zeros(len(self.taps) - 1)
+        # Index of the next output sample in the upsampled, filtered stream;
+        # starting at the filter delay keeps the output aligned with the input
+        self.next_index = self.half_len
+
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        from scipy.signal import lfilter
+        upsampled = np.zeros(len(audio) * self.up)
+        upsampled[::self.up] = audio
+        filtered, self.state = lfilter(self.taps, 1.0, upsampled, zi=self.state)
+        out = filtered[self.next_index::self.down]
+        self.next_index += len(out) * self.down - len(upsampled)
+        return out.astype(np.float32)
+
+    def flush(self) -> np.ndarray:
+        """Return the samples still held back by the filter delay."""
+        return self.process(np.zeros(-(-self.half_len // self.up)))
+
+def mulaw_encode(audio: np.ndarray) -> np.ndarray:
+    """Encode float samples in [-1, 1] to 8-bit G.711 mu-law."""
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int32)
+    sign = (pcm < 0).astype(np.int32) << 7
+    magnitude = np.minimum(np.abs(pcm), 32635) + 0x84
+    exponent = np.floor(np.log2(magnitude)).astype(np.int32) - 7
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8)
+
+def mulaw_decode(data: np.ndarray) -> np.ndarray:
+    """Decode 8-bit G.711 mu-law to float samples in [-1, 1]."""
+    value = ~data.astype(np.int32) & 0xFF
+    exponent = (value >> 4) & 0x07
+    mantissa = value & 0x0F
+    magnitude = (((mantissa << 3) + 0x84) << exponent) - 0x84
+    pcm = np.where(value & 0x80, -magnitude, magnitude)
+    return (pcm / 32768.0).astype(np.float32)
+
+def encode_audio(audio: np.ndarray, encoding: str, source_rate: int = SAMPLE_RATE) -> bytes:
+    """Convert model output to the bytes sent for `encoding`."""
+    if encoding == 'float32':
+        return audio.astype(np.float32).tobytes()
+    if encoding == 'int16':
+        return (np.clip(audio, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+    if encoding == 'mulaw':
+        audio = resample(audio, source_rate, output_sample_rate(encoding, source_rate))
+        return mulaw_encode(audio).tobytes()
+    raise ValueError(f"Unsupported encoding '{encoding}' (choose from {', '.join(ENCODINGS)})")
+
+class AudioEncoder:
+    """Encode the consecutive pieces of one audio stream for `encoding`.
+
+    Unlike calling `encode_audio` per piece, resampling for mu-law carries
+    over between pieces; send `flush()` after the last one.
+    """
+
+    def __init__(self, encoding: str, source_rate: int = SAMPLE_RATE):
+        if encoding not in ENCODINGS:
+            raise ValueError(
+                f"Unsupported encoding '{encoding}' (choose from {', '.join(ENCODINGS)})"
+            )
+        self.encoding = encoding
+        self.rate = output_sample_rate(encoding, source_rate)
+        self.resampler = StreamResampler(source_rate, self.rate) if self.rate != source_rate else None
+
+    def encode(self, audio: np.ndarray) -> bytes:
+        if self.resampler is not None:
+            audio = self.resampler.process(audio)
+        return encode_audio(audio, self.encoding, self.rate)
+
+    def flush(self) -> bytes:
+        if self.resampler is None:
+            return b''
+        return encode_audio(self.resampler.flush(), self.encoding, self.rate)
+
+def decode_audio(data: bytes, encoding: str) -> np.ndarray:
+    """Convert received bytes back to float32 samples."""
+    if encoding == 'float32':
+        return np.frombuffer(data, dtype=np.float32)
+    if encoding == 'int16':
+        return np.frombuffer(data, dtype='<i2').astype(np.float32) / 32767
+    if encoding == 'mulaw':
+        return mulaw_decode(np.frombuffer(data, dtype=np.uint8))
+    raise ValueError(f"Unsupported encoding '{encoding}' (choose from {', '.join(ENCODINGS)})")
+
+def send_frame(sock: socket.socket, payload: bytes):
+    sock.sendall(struct.pack('>I', len(payload)) + payload)
+
+def send_header(sock: socket.socket, **fields):
+    send_frame(sock, json.dumps(fields).encode('utf-8'))
+
+def recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    """Read exactly `size` bytes, or return None if the peer closed first."""
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(min(size - len(data), 65536))
+        if not chunk:
+            return None
+        data.extend(chunk)
+    return bytes(data)
+
+def recv_frame(sock: socket.socket) -> Optional[bytes]:
+    """Read one frame; None if the connection closed mid-stream."""
+    prefix = recv_exact(sock, 4)
+    if prefix is None:
+        return None
+    (size,) = struct.unpack('>I', prefix)
+    if size == 0:
+        return b''
+    return recv_exact(sock, size)
+
+def recv_header(sock: socket.socket) -> dict:
+    """Read and validate the header frame of a negotiated response."""
+    prefix = recv_exact(sock, 4)
+    if prefix is None:
+        raise ConnectionError("Server closed the connection without a response")
+    (size,) = struct.unpack('>I', prefix)
+    data = recv_exact(sock, size) if 0 < size <= MAX_HEADER_SIZE else None
+    try:
+        header = json.loads(data.decode('utf-8'))
+    except (AttributeError, UnicodeDecodeError, json.JSONDecodeError):
+        raise ConnectionError(
+            "Invalid response header; the server may not support encoding negotiation"
+        )
+    if 'error' in header:
+        raise RuntimeError(f"Server error: {header['error']}")
+    return header
@@ -0,0 +1,211 @@
+import os
+import re
+import json
+import time
+import uuid
+import queue
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+from .cancellation import CancellationToken, CancelledError
+from .codec import SAMPLE_RATE
+
+FINISHED = ('done', 'failed', 'cancelled')
+
+_JOB_ID = re.compile(r'[0-9a-f]{32}')
+
+class Job:
+    """A queued or running render whose progress is mirrored to the spool."""
+
+    def __init__(self, job_id: str, text: str, voice: str, speed: float):
+        self.id = job_id
+        self.text = text
+        self.voice = voice
+        self.speed = speed
+        self.status = 'queued'
+        self.chunks_done = 0
+        self.chunks_total = 0
+        self.audio_seconds = 0.0
+        self.message = None
+        self.created = time.time()
+        self.finished = None
+        self.token = CancellationToken()
+
+    def to_dict(self) -> dict:
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'voice': self.voice,
+            'speed': self.speed,
+            'chunks_done': self.chunks_done,
+            'chunks_total': self.chunks_total,
+            'audio_seconds': round(self.audio_seconds, 3),
+            'message': self.message,
+            'created': self.created,
+            'finished': self.finished,
+            'pid': os.getpid()
+        }
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class JobManager:
+    """Run renders in the background, independent of any client connection.
+
+    Each job writes its audio as raw float32 samples to `<id>.pcm` in the
+    spool directory as chunks finish, next to a `<id>.json` status file.
+    Everything a client asks about a job is answered from those files, so
+    any worker process sharing the spool directory can serve it. At most
+    `max_concurrent` jobs render at once; the rest wait in a queue.
+
+    `render(job, token, on_progress)` yields the job's audio pieces in order
+    and updates `job.chunks_total` and `job.chunks_done`, calling
+    `on_progress()` to publish them. It must only count a chunk once its
+    audio has been yielded, so the status never runs ahead of the file.
+    """
+
+    def __init__(self, spool_dir: Path, render: Callable, max_concurrent: int = 2,
+                 retention: float = 24 * 3600, registry=None):
+        self.spool_dir = Path(spool_dir)
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self.render = render
+        self.retention = retention
+        self.max_concurrent = max_concurrent
+        self.pending = queue.Queue()
+        self.threads = []
+        self.lock = threading.Lock()
+
+        self.m_jobs = self.m_running = None
+        if registry is not None:
+            self.m_jobs = registry.counter(
+                'kokoro_jobs_total', 'Background jobs finished, by status')
+            self.m_running = registry.gauge(
+                'kokoro_jobs_running', 'Background jobs currently rendering')
+
+    def _path(self, job_id: str, suffix: str) -> Path:
+        if not _JOB_ID.fullmatch(job_id or ''):
+            raise ValueError(f"Invalid job ID '{job_id}'")
+        return self.spool_dir / f'{job_id}{suffix}'
+
+    def _save(self, job: Job):
+        path = self._path(job.id, '.json')
+        tmp = path.with_name(f'{job.id}.{threading.get_ident()}.tmp')
+        tmp.write_text(json.dumps(job.to_dict()))
+        os.replace(tmp, path)
+
+    def submit(self, text: str, voice: str, speed: float) -> Job:
+        self.prune()
+        job = Job(uuid.uuid4().hex, text, voice, speed)
+        # A cancel marker lets any process sharing the spool stop the job
+        cancel_path = self._path(job.id, '.cancel')
+        job.token.add_check(cancel_path.exists, reason='cancelled by client')
+        self._path(job.id, '.pcm').touch()
+        self._save(job)
+        with self.lock:
+            # Started on first use so that forked server processes get their own
+            if not self.threads:
+                self.threads = [threading.Thread(target=self._worker_loop, daemon=True)
+                                for _ in range(self.max_concurrent)]
+                for thread in self.threads:
+                    thread.start()
+        self.pending.put(job)
+        return job
+
+    def status(self, job_id: str) -> dict:
+        try:
+            status = json.loads(self._path(job_id, '.json').read_text())
+        except FileNotFoundError:
+            raise ValueError(f"Unknown job '{job_id}'")
+        if status['status'] not in FINISHED and not _pid_alive(status['pid']):
+            # The process rendering it went away (e.g. a server restart)
+            status.update(status='failed', message='server stopped before the job finished')
+        return status
+
+    def cancel(self, job_id: str) -> dict:
+        status = self.status(job_id)
+        if status['status'] not in FINISHED:
+            self._path(job_id, '.cancel').touch()
+        return status
+
+    def stream(self, job_id: str, token: Optional[CancellationToken] = None,
+               block_seconds: float = 1.0, poll_interval: float = 0.2) -> Iterator[np.ndarray]:
+        """Yield a job's audio from the spool, following it until the job ends."""
+        block_size = int(block_seconds * SAMPLE_RATE) * 4
+        with open(self._path(job_id, '.pcm'), 'rb') as f:
+            buffer = b''
+            while True:
+                # Read the status first: once it says finished, the
+                # audio file is already complete
+                status = self.status(job_id)
+                data = f.read(block_size - len(buffer))
+                buffer += data
+                usable = len(buffer) - len(buffer) % 4
+                if usable and (usable == block_size or not data):
+                    yield np.frombuffer(buffer[:usable], dtype=np.float32)
+                    buffer = buffer[usable:]
+                if data:
+                    continue
+                if status['status'] == 'done':
+                    return
+                if status['status'] in FINISHED:
+                    raise RuntimeError(f"Job {status['status']}: {status['message']}")
+                if token is not None:
+                    token.raise_if_cancelled()
+                time.sleep(poll_interval)
+
+    def prune(self):
+        """Delete the spool files of jobs that finished longer ago than the retention."""
+        cutoff = time.time() - self.retention
+        for path in self.spool_dir.glob('*.json'):
+            try:
+                status = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            if status['status'] in FINISHED and (status['finished'] or 0) < cutoff:
+                for suffix in ('.json', '.pcm', '.cancel'):
+                    try:
+                        (self.spool_dir / f"{status['job_id']}{suffix}").unlink()
+                    except FileNotFoundError:
+                        pass
+
+    def _worker_loop(self):
+        while True:
+            job = self.pending.get()
+            if self.m_running:
+                self.m_running.inc()
+            try:
+                self._run(job)
+            finally:
+                if self.m_running:
+                    self.m_running.dec()
+                if self.m_jobs:
+                    self.m_jobs.inc(status=job.status)
+
+    def _run(self, job: Job):
+        try:
+            job.token.raise_if_cancelled()
+            job.status = 'running'
+            self._save(job)
+            with open(self._path(job.id, '.pcm'), 'ab') as f:
+                for audio in self.render(job, job.token, lambda: self._save(job)):
+                    f.write(np.asarray(audio, dtype=np.float32).tobytes())
+                    f.flush()
+                    job.audio_seconds += len(audio) / SAMPLE_RATE
+            job.status = 'done'
+        except CancelledError as e:
+            job.status = 'cancelled'
+            job.message = str(e)
+        except Exception as e:
+            job.status = 'failed'
+            job.message = str(e)
+            print(f"Job {job.id} failed: {e}")
+        finally:
+            job.finished = time.time()
+            self._save(job)
@@ -0,0 +1,180 @@
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+DEFAULT_PATH = Path.home() / '.cache' / 'kokoro-tts-cli' / 'lexicon.sqlite'
+
+# Refresh an entry's last-used time at most this often, so hits rarely write
+TOUCH_INTERVAL = 3600.0
+
+def normalize(text: str) -> str:
+    return ' '.join(text.split())
+
+class PhonemeLexicon:
+    """Persistent phoneme cache in a SQLite file, keyed by (lang, normalized text).
+
+    The database runs in WAL mode so readers never block on the writer,
+    and several threads and processes can share one file. Each thread (and
+    each forked process) opens its own connection on first use. SQLite
+    connections must not cross a fork, so a process that has used the
+    lexicon calls `close()` before forking. Once the lexicon holds
+    more than `max_entries`, the least recently used entries are dropped.
+    After the first error the lexicon is bypassed for the rest of the run,
+    so a broken or locked file costs one warning rather than a stall per
+    lookup: the lexicon only ever saves work, it is never needed for
+    correct output.
+    """
+
+    def __init__(self, path: Path = DEFAULT_PATH, max_entries: int = 200000,
+                 evict_every: int = 500):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.inserts = 0
+        self.hits = 0
+        self.misses = 0
+        self.failed = False
+        self.on_lookup: Optional[Callable[[bool], None]] = None
+        self.connections = []  # (pid, connection) of every thread's connection
+        self.generation = 0  # Bumped by close() so threads reconnect
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None and self.local.owner == (os.getpid(), self.generation):
+            return conn
+        # Not bound to its thread so that close() can close it from any thread
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None,
+                               check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=5000')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS phonemes ('
+            'lang TEXT NOT NULL, text TEXT NOT NULL, phonemes TEXT NOT NULL, '
+            'used REAL NOT NULL, PRIMARY KEY (lang, text))'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS phonemes_used ON phonemes (used)')
+        with self.lock:
+            self.connections.append((os.getpid(), conn))
+            self.local.owner = (os.getpid(), self.generation)
+        self.local.conn = conn
+        return conn
+
+    def close(self):
+        """Close every connection this process opened; the next lookup reconnects.
+
+        Call it while no other thread is using the lexicon, e.g. before forking.
+        """
+        with self.lock:
+            pid = os.getpid()
+            mine = [conn for owner, conn in self.connections if owner == pid]
+            self.connections = []
+            self.generation += 1
+        for conn in mine:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def _warn(self, error: Exception):
+        if not self.failed:
+            self.failed = True
+            print(f"Warning: phoneme lexicon {self.path} unavailable: {error}", file=sys.stderr)
+
+    def get(self, lang: str, text: str) -> Optional[str]:
+        if self.failed:
+            return None
+        key = normalize(text)
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT phonemes, used FROM phonemes WHERE lang = ? AND text = ?', (lang, key)
+            ).fetchone()
+            if row is not None and row[1] < time.time() - TOUCH_INTERVAL:
+                conn.execute(
+                    'UPDATE phonemes SET used = ? WHERE lang = ? AND text = ?',
+                    (time.time(), lang, key)
+                )
+        except sqlite3.Error as e:
+            self._warn(e)
+            return None
+        return row[0] if row is not None else None
+
+    def put(self, lang: str, text: str, phonemes: str):
+        if self.failed:
+            return
+        try:
+            self._connect().execute(
+                'INSERT OR REPLACE INTO phonemes (lang, text, phonemes, used) VALUES (?, ?, ?, ?)',
+                (lang, normalize(text), phonemes, time.time())
+            )
+        except sqlite3.Error as e:
+            self._warn(e)
+            return
+        with self.lock:
+            self.inserts += 1
+            evict = self.inserts % self.evict_every == 0
+        if evict:
+            self.evict()
+
+    def evict(self):
+        """Drop the least recently used entries beyond `max_entries`."""
+        if self.failed:
+            return
+        try:
+            conn = self._connect()
+            (count,) = conn.execute('SELECT COUNT(*) FROM phonemes').fetchone()
+            if count > self.max_entries:
+                conn.execute(
+                    'DELETE FROM phonemes WHERE rowid IN '
+                    '(SELECT rowid FROM phonemes ORDER BY used LIMIT ?)',
+                    (count - self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            self._warn(e)
+
+    def lookup(self, lang: str, text: str, phonemize: Callable[[str, str], str]) -> str:
+        """Return the phonemes of `text`, computing and storing them on a miss."""
+        phonemes = self.get(lang, text)
+        hit = phonemes is not None
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if self.on_lookup:
+            self.on_lookup(hit)
+        if hit:
+            return phonemes
+        phonemes = phonemize(text, lang)
+        self.put(lang, text, phonemes)
+        return phonemes
+
+def add_lexicon_arguments(parser: argparse.ArgumentParser):
+    """Add phoneme lexicon options to a command line parser."""
+    parser.add_argument('--lexicon', type=str,
+                      default=os.environ.get('KOKORO_LEXICON', str(DEFAULT_PATH)),
+                      help='Persistent phoneme cache shared across runs '
+                           f'(default: $KOKORO_LEXICON or {DEFAULT_PATH})')
+    parser.add_argument('--lexicon-size', type=int, default=200000,
+                      help='Maximum number of cached entries (default: 200000)')
+    parser.add_argument('--no-lexicon', action='store_true',
+                      help='Always phonemize from scratch')
+
+def lexicon_from_args(args) -> Optional[PhonemeLexicon]:
+    """Open the lexicon selected on the command line, or None if disabled."""
+    if args.no_lexicon:
+        return None
+    try:
+        return PhonemeLexicon(Path(args.lexicon).expanduser(), max_entries=args.lexicon_size)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Warning: phoneme lexicon {args.lexicon} unavailable: {e}", file=sys.stderr)
+        return None
@@ -0,0 +1,88 @@
+import sys
+import threading
+from typing import Callable, Dict, List, Optional
+from .cancellation import CancellationToken, CancelledError
+
+class RenderBuffer:
+    """Render segments ahead of playback and keep recently played ones.
+
+    A background thread renders the `ahead` segments after the current
+    position. Up to `history` segments before the position are kept, and as
+    many beyond the lookahead, so skipping back and listening on again never
+    re-synthesizes. Audio outside that window is dropped to bound memory.
+
+    `render(index, token)` should check the token between chunks so that
+    `stop()` does not wait for a whole segment to finish.
+    """
+
+    def __init__(self, count: int, render: Callable[[int, CancellationToken], List],
+                 ahead: int = 3, history: int = 20):
+        self.count = count
+        self.render = render
+        self.ahead = ahead
+        self.history = history
+        self.position = 0
+        self.segments: Dict[int, List] = {}
+        self.cond = threading.Condition()
+        self.token = CancellationToken()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._render_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.token.cancel('stopped')
+        with self.cond:
+            self.cond.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+
+    def seek(self, index: int):
+        """Move the window to `index`, rendering from there on."""
+        with self.cond:
+            self.position = max(0, min(self.count - 1, index))
+            for i in list(self.segments):
+                if not self._keep(i):
+                    del self.segments[i]
+            self.cond.notify_all()
+
+    def get(self, index: int, timeout: Optional[float] = None) -> Optional[List]:
+        """Return a rendered segment, or None if it is not ready within `timeout`."""
+        with self.cond:
+            self.cond.wait_for(lambda: index in self.segments or self.token.cancelled, timeout)
+            return self.segments.get(index)
+
+    def _keep(self, index: int) -> bool:
+        return (self.position - self.history <= index
+                <= self.position + self.ahead + self.history)
+
+    def _next_missing(self) -> Optional[int]:
+        for i in range(self.position, min(self.count, self.position + self.ahead + 1)):
+            if i not in self.segments:
+                return i
+        return None
+
+    def _render_loop(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(
+                    lambda: self.token.cancelled or self._next_missing() is not None
+                )
+                if self.token.cancelled:
+                    return
+                index = self._next_missing()
+
+            try:
+                segment = self.render(index, self.token)
+            except CancelledError:
+                return
+            except Exception as e:
+                print(f"Error rendering segment {index + 1}: {e}", file=sys.stderr)
+                segment = []
+
+            with self.cond:
+                # The listener may have skipped elsewhere in the meantime
+                if self._keep(index):
+                    self.segments[index] = segment
+                    self.cond.notify_all()
@@ -0,0 +1,166 @@
+import re
+import sys
+from typing import Callable, List, Sequence, Tuple
+
+# Cost of ending a chunk at each kind of boundary; among packings with the
+# fewest chunks the one with the cheapest breaks wins
+BREAK_PENALTY = {'sentence': 0, 'clause': 1, 'word': 4}
+
+CLAUSE_BREAK = re.compile(r'(?<=[,;:])\s+')
+
+Piece = Tuple[str, int, str]  # text, token count, kind of boundary after it
+
+class PackStats:
+    """How well a text was packed into chunks.
+
+    `greedy_chunks` is an estimate from the same piece counts, not the
+    output of `create_chunks`, which splits long sentences by its own rules.
+    """
+
+    def __init__(self, chunks: int, greedy_chunks: int, tokens: int, max_tokens: int):
+        self.chunks = chunks
+        self.greedy_chunks = greedy_chunks
+        self.tokens = tokens
+        self.max_tokens = max_tokens
+
+    @property
+    def fill(self) -> float:
+        """Fraction of the per-chunk token budget actually used."""
+        if not self.chunks:
+            return 0.0
+        return self.tokens / (self.chunks * self.max_tokens)
+
+    def __str__(self):
+        return (f"{self.chunks} chunks (greedy estimate: {self.greedy_chunks}), "
+                f"{self.tokens} tokens, {self.fill:.0%} of the {self.max_tokens}-token budget used")
+
+def _truncate_word(word: str, tokens: int, count_tokens: Callable[[str], int],
+                  max_tokens: int) -> Tuple[str, int]:
+    """Cut a word that alone exceeds the limit until it fits, marking the cut with '...'."""
+    keep = len(word)
+    text = word
+    while tokens > max_tokens and keep > 1:
+        keep = max(1, min(keep - 1, int(keep * max_tokens / tokens)))
+        text = word[:keep] + '...'
+        tokens = count_tokens(text)
+    return text, tokens
+
+def split_pieces(sentences: Sequence[str], count_tokens: Callable[[str], int],
+                 max_tokens: int = 450) -> List[Piece]:
+    """Break sentences into pieces that each fit in a chunk, counting tokens once per piece.
+
+    Sentences over the limit are split at clause punctuation, and clauses
+    still over the limit at words; a single word over the limit is truncated.
+    """
+    pieces = []
+    for sentence in sentences:
+        tokens = count_tokens(sentence)
+        if tokens <= max_tokens:
+            pieces.append((sentence, tokens, 'sentence'))
+            continue
+        for clause in CLAUSE_BREAK.split(sentence):
+            tokens = count_tokens(clause)
+            if tokens <= max_tokens:
+                pieces.append((clause, tokens, 'clause'))
+                continue
+            for word in clause.split():
+                tokens = count_tokens(word)
+                if tokens > max_tokens:
+                    print(f"Warning: Word '{word[:30]}' exceeds token limit and will be truncated",
+                          file=sys.stderr)
+                    word, tokens = _truncate_word(word, tokens, count_tokens, max_tokens)
+                pieces.append((word, tokens, 'word'))
+            pieces[-1] = pieces[-1][:2] + ('clause',)
+        pieces[-1] = pieces[-1][:2] + ('sentence',)
+    return pieces
+
+def _span_tokens(prefix: List[int], i: int, j: int) -> int:
+    # Pieces are joined with a space, which is one token
+    return prefix[j] - prefix[i] + (j - i - 1)
+
+def pack_pieces(pieces: Sequence[Piece], max_tokens: int = 450) -> List[Tuple[int, int]]:
+    """Group consecutive pieces into the fewest chunks under `max_tokens`.
+
+    Dynamic programming over piece boundaries; ties are broken by
+    preferring to end chunks at sentence, then clause boundaries.
+    Returns (start, end) piece index ranges.
+    """
+    n = len(pieces)
+    prefix = [0]
+    for _, tokens, _ in pieces:
+        prefix.append(prefix[-1] + tokens)
+
+    best = [(0, 0)] + [None] * n
+    start = [0] * (n + 1)
+    for j in range(1, n + 1):
+        penalty = BREAK_PENALTY[pieces[j - 1][2]] if j < n else 0
+        for i in range(j - 1, -1, -1):
+            # A single piece always forms a chunk, even if it is too long
+            if i < j - 1 and _span_tokens(prefix, i, j) > max_tokens:
+                break
+            cost = (best[i][0] + 1, best[i][1] + penalty)
+            if best[j] is None or cost < best[j]:
+                best[j] = cost
+                start[j] = i
+
+    spans = []
+    j = n
+    while j > 0:
+        spans.append((start[j], j))
+        j = start[j]
+    return spans[::-1]
+
+def _greedy_chunks(groups: Sequence[Sequence[Piece]], max_tokens: int) -> int:
+    """Estimate the chunk count of the sentence-by-sentence packing of `create_chunks`.
+
+    Whole sentences are packed first-fit; the parts of a split sentence
+    are packed among themselves, never together with their neighbours.
+    Pieces are joined at a one-token space and split at this module's
+    clause and word boundaries, so the figure can be off by a chunk or so
+    for texts with sentences over the limit.
+    """
+    chunks = 0
+    current = None
+    for group in groups:
+        if len(group) > 1:
+            current = None
+        for _, tokens, _ in group:
+            if current is not None and current + 1 + tokens <= max_tokens:
+                current += 1 + tokens
+            else:
+                chunks += 1
+                current = tokens
+        if len(group) > 1:
+            current = None
+    return chunks
+
+def pack_sentences(sentences: Sequence[str], count_tokens: Callable[[str], int],
+                   max_tokens: int = 450) -> Tuple[List[str], PackStats]:
+    """Pack sentences into the fewest chunks that fit the token limit.
+
+    Joined chunks are re-counted, since phonemizing text in context can
+    differ slightly from the sum of its pieces; a chunk that ends up over
+    the limit is packed again with a tighter budget.
+    """
+    groups = [split_pieces([sentence], count_tokens, max_tokens) for sentence in sentences]
+    pieces = [piece for group in groups for piece in group]
+
+    def pack(first: int, last: int, budget: int) -> List[Tuple[str, int]]:
+        chunks = []
+        for i, j in pack_pieces(pieces[first:last], budget):
+            text = ' '.join(piece[0] for piece in pieces[first + i:first + j])
+            tokens = count_tokens(text) if j - i > 1 else pieces[first + i][1]
+            if tokens > max_tokens and j - i > 1:
+                chunks.extend(pack(first + i, first + j, budget - (tokens - max_tokens)))
+            else:
+                chunks.append((text, tokens))
+        return chunks
+
+    packed = pack(0, len(pieces), max_tokens)
+    stats = PackStats(
+        chunks=len(packed),
+        greedy_chunks=_greedy_chunks(groups, max_tokens),
+        tokens=sum(tokens for _, tokens in packed),
+        max_tokens=max_tokens
+    )
+    return [text for text, _ in packed], stats
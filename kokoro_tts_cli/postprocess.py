@@ -0,0 +1,92 @@
+import argparse
+import numpy as np
+from typing import Iterable, Iterator
+
+class ChunkJoiner:
+    """Trim silence around synthesized chunks and crossfade their joins.
+
+    Chunks are pushed one at a time as they come out of the model. Leading
+    and trailing silence is cut so that consecutive chunks are separated by
+    about `pause_ms`, and each join is smoothed with an equal-power
+    crossfade of `crossfade_ms`. Only the last `crossfade_ms` of audio is
+    held back between pushes, so the stage adds almost no latency.
+    """
+
+    def __init__(self, sample_rate: int = 24000, pause_ms: float = 200.0,
+                 crossfade_ms: float = 10.0, threshold_db: float = -50.0,
+                 frame_ms: float = 10.0, trim: bool = True):
+        self.sample_rate = sample_rate
+        self.crossfade = int(sample_rate * crossfade_ms / 1000)
+        self.frame = max(1, int(sample_rate * frame_ms / 1000))
+        self.threshold = 10 ** (threshold_db / 20)
+        self.trim_silence = trim
+        # Each side keeps half the pause plus half the overlap lost to the crossfade
+        self.pad = int(sample_rate * pause_ms / 2000) + self.crossfade // 2
+        self.tail = None
+
+    def trim(self, audio: np.ndarray) -> np.ndarray:
+        """Cut leading and trailing silence down to `pad` samples."""
+        frames = len(audio) // self.frame
+        if frames == 0:
+            return audio
+        blocks = audio[:frames * self.frame].reshape(frames, self.frame)
+        rms = np.sqrt(np.mean(np.square(blocks, dtype=np.float64), axis=1))
+        active = np.flatnonzero(rms > self.threshold)
+        if len(active) == 0:
+            return audio[:2 * self.pad]
+        start = max(0, active[0] * self.frame - self.pad)
+        end = min(len(audio), (active[-1] + 1) * self.frame + self.pad)
+        return audio[start:end]
+
+    def push(self, audio: np.ndarray) -> np.ndarray:
+        """Add the next chunk and return the audio that is ready to play."""
+        audio = np.asarray(audio, dtype=np.float32)
+        if self.trim_silence:
+            audio = self.trim(audio)
+
+        parts = []
+        if self.tail is not None and len(self.tail):
+            overlap = min(len(self.tail), len(audio))
+            t = np.linspace(0.0, 1.0, overlap, dtype=np.float32) * (np.pi / 2)
+            parts.append(self.tail[:len(self.tail) - overlap])
+            parts.append(self.tail[len(self.tail) - overlap:] * np.cos(t) + audio[:overlap] * np.sin(t))
+            audio = audio[overlap:]
+
+        # Hold back the end of this chunk to crossfade it with the next one
+        hold = min(self.crossfade, len(audio))
+        parts.append(audio[:len(audio) - hold])
+        self.tail = audio[len(audio) - hold:]
+        return np.concatenate(parts).astype(np.float32, copy=False)
+
+    def flush(self) -> np.ndarray:
+        """Return the held-back end of the last chunk."""
+        tail = self.tail if self.tail is not None else np.zeros(0, dtype=np.float32)
+        self.tail = None
+        return tail
+
+    def process(self, chunks: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        """Join a sequence of chunks, yielding non-empty pieces of audio."""
+        for chunk in chunks:
+            out = self.push(chunk)
+            if len(out):
+                yield out
+        out = self.flush()
+        if len(out):
+            yield out
+
+def add_postprocess_arguments(parser: argparse.ArgumentParser):
+    """Add silence trimming and crossfade options to a command line parser."""
+    parser.add_argument('--pause-ms', type=float, default=200.0,
+                      help='Pause kept between chunks after trimming silence (default: 200)')
+    parser.add_argument('--crossfade-ms', type=float, default=10.0,
+                      help='Crossfade applied at chunk joins (default: 10)')
+    parser.add_argument('--no-trim', action='store_false', dest='trim',
+                      help='Keep the silence the model produces around each chunk')
+
+def joiner_settings_from_args(args) -> dict:
+    """Keyword arguments for ChunkJoiner from parsed command line options."""
+    return {
+        'pause_ms': args.pause_ms,
+        'crossfade_ms': args.crossfade_ms,
+        'trim': args.trim,
+    }
@@ -0,0 +1,175 @@
+import os
+import sys
+import json
+import time
+import torch
+import ctypes
+import signal
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+from .metrics import Registry
+
+def share_model_memory(model, voices: dict):
+    """Move model weights and voicepacks to shared memory before forking.
+
+    Forked workers then map the same physical pages instead of copying
+    them the first time Python touches a tensor object.
+    """
+    modules = model.values() if isinstance(model, dict) else [model]
+    for module in modules:
+        module.share_memory()
+    for voicepack in voices.values():
+        voicepack.share_memory_()
+
+PR_SET_PDEATHSIG = 1
+
+def _exit_with_parent(parent_pid: int):
+    """Have the kernel send SIGTERM to this process when the parent dies (Linux only)."""
+    if sys.platform.startswith('linux'):
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            libc.prctl(PR_SET_PDEATHSIG, signal.SIGTERM)
+        except (OSError, AttributeError):
+            pass
+    if os.getppid() != parent_pid:
+        sys.exit(0)  # The parent is already gone
+
+class PreforkServer:
+    """Run several forked copies of a KokoroTTSServer on one listening socket.
+
+    The parent loads the model and voicepacks once, binds the port and forks
+    `processes` workers that inherit both; each worker accepts connections
+    on the shared socket. The parent supervises the workers, restarting any
+    that exit, and serves the metrics of all workers summed together.
+    """
+
+    def __init__(self, server, processes: int, torch_threads: Optional[int] = None,
+                 worker_init: Optional[Callable] = None, metrics_interval: float = 1.0):
+        if not hasattr(os, 'fork'):
+            raise RuntimeError("--processes requires a platform with fork()")
+        if torch.cuda.is_available():
+            raise RuntimeError("--processes is only supported for CPU inference")
+        self.server = server
+        self.processes = processes
+        self.torch_threads = torch_threads
+        self.worker_init = worker_init
+        self.metrics_interval = metrics_interval
+        self.metrics_dir = Path(tempfile.mkdtemp(prefix='kokoro-metrics-'))
+        self.children = {}  # pid -> worker index
+        self.running = False
+
+        self.registry = Registry()
+        self.m_workers = self.registry.gauge(
+            'kokoro_worker_processes', 'Worker processes currently running')
+        self.m_restarts = self.registry.counter(
+            'kokoro_worker_restarts_total', 'Worker processes restarted after exiting')
+
+    def render(self) -> str:
+        """Aggregate the latest metrics snapshot of every worker."""
+        aggregate = Registry()
+        aggregate.merge(self.registry.snapshot())
+        live = set(self.children)
+        for path in self.metrics_dir.glob('worker-*.json'):
+            try:
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            # Counters of exited workers still count; their gauges do not
+            pid = int(path.stem.split('-')[1])
+            aggregate.merge(snapshot, gauges=pid in live)
+        return aggregate.render()
+
+    def _write_metrics(self):
+        path = self.metrics_dir / f'worker-{os.getpid()}.json'
+        tmp = path.with_suffix('.tmp')
+        while True:
+            tmp.write_text(json.dumps(self.server.registry.snapshot()))
+            os.replace(tmp, path)
+            time.sleep(self.metrics_interval)
+
+    def _spawn(self, index: int):
+        parent_pid = os.getpid()
+        pid = os.fork()
+        if pid:
+            self.children[pid] = index
+            return
+
+        # Worker process: the parent handles Ctrl+C and stops us with SIGTERM
+        status = 0
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+            _exit_with_parent(parent_pid)
+            self.server.registry.reset()
+            if self.server.trace_log:
+                self.server.trace_log.reopen()
+            if self.torch_threads:
+                torch.set_num_threads(self.torch_threads)
+            if self.worker_init:
+                self.worker_init(self.server, index)
+            threading.Thread(target=self._write_metrics, daemon=True).start()
+            self.server.serve()
+        except SystemExit:
+            pass
+        except Exception as e:
+            print(f"Worker {index} failed: {e}", file=sys.stderr)
+            status = 1
+        finally:
+            try:
+                self.server.stop()  # flushes trace log and profiler output
+            finally:
+                os._exit(status)
+
+    def start(self):
+        self.server.preload_voices()
+        share_model_memory(self.server.model, self.server.voices)
+        self.server.bind()
+        self.running = True
+        # A plain `kill` of the parent must not leave workers serving the port
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+
+        for index in range(self.processes):
+            self._spawn(index)
+        self.m_workers.set(len(self.children))
+
+        self.server.start_metrics(self)
+        print(f"KokoroTTS Server running on {self.server.host}:{self.server.port} "
+              f"({self.processes} processes x {self.server.workers} workers)")
+
+        while self.running:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            index = self.children.pop(pid, None)
+            self.m_workers.set(len(self.children))
+            if index is None or not self.running:
+                continue
+            print(f"Worker {index} (pid {pid}) exited with status {status}, restarting",
+                  file=sys.stderr)
+            self.m_restarts.inc()
+            time.sleep(1.0)  # Avoid a tight restart loop if workers die on startup
+            self._spawn(index)
+            self.m_workers.set(len(self.children))
+
+    def stop(self):
+        self.running = False
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in list(self.children):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.children.clear()
+        if self.server.server_socket:
+            self.server.server_socket.close()
+        if self.server.metrics_server:
+            self.server.metrics_server.stop()
+        shutil.rmtree(self.metrics_dir, ignore_errors=True)
@@ -0,0 +1,186 @@
+import os
+import sys
+import time
+import json
+import cProfile
+import argparse
+import functools
+import threading
+from pathlib import Path
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterable, Optional
+
+# Functions on the synthesis hot path wrapped by --profile
+HOT_PATH = ['create_chunks', 'get_chunk_tokens', 'generate']
+
+class Profiler:
+    """Opt-in timing and profiling for the synthesis pipeline.
+
+    Wrapped functions accumulate call counts and wall time with a couple of
+    perf_counter calls per invocation. A background thread samples the
+    stacks of all threads at a fixed interval and writes them in the
+    collapsed format understood by flamegraph.pl and speedscope. Every
+    `dump_every` requests, one request is run under cProfile (and
+    optionally the torch profiler) and its trace is written to `out_dir`.
+    """
+
+    def __init__(self, out_dir: str = 'kokoro-profile', dump_every: int = 0,
+                 torch_profile: bool = False, sample_interval: float = 0.01):
+        self.out_dir = Path(out_dir)
+        self.dump_every = dump_every
+        self.torch_profile = torch_profile
+        self.sample_interval = sample_interval
+        self.timings = {}  # name -> [calls, total seconds, max seconds]
+        self.stacks = Counter()
+        self.requests = 0
+        self.lock = threading.Lock()
+        self._deep = threading.Lock()  # one cProfile session at a time
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def wrap(self, name: str, fn, request: bool = False):
+        """Time calls to `fn`; with `request` each call also counts as a request."""
+        if getattr(fn, '_kokoro_profiled', False):
+            return fn
+        timings = self.timings
+        lock = self.lock
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                if request:
+                    with self.request():
+                        return fn(*args, **kwargs)
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with lock:
+                    entry = timings.get(name)
+                    if entry is None:
+                        entry = timings[name] = [0, 0.0, 0.0]
+                    entry[0] += 1
+                    entry[1] += elapsed
+                    if elapsed > entry[2]:
+                        entry[2] = elapsed
+
+        wrapper._kokoro_profiled = True
+        return wrapper
+
+    def install(self, target, names: Iterable[str] = HOT_PATH, prefix: str = '',
+                requests: Iterable[str] = ()):
+        """Replace `names` on a module or class with timed wrappers.
+
+        Calls to functions listed in `requests` are counted as requests for
+        the purpose of `dump_every`.
+        """
+        for name in names:
+            fn = getattr(target, name, None)
+            if fn is not None:
+                setattr(target, name, self.wrap(prefix + name, fn, request=name in requests))
+
+    def start(self):
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+        self._sampler.start()
+
+    def _sample_loop(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.sample_interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    @contextmanager
+    def request(self):
+        """Mark one unit of work, profiling it in depth every `dump_every` calls."""
+        with self.lock:
+            self.requests += 1
+            number = self.requests
+        if not self.dump_every or number % self.dump_every or not self._deep.acquire(blocking=False):
+            yield
+            return
+
+        base = self.out_dir / f'request-{number:06d}'
+        profile = cProfile.Profile()
+        torch_prof = None
+        if self.torch_profile:
+            import torch
+            activities = [torch.profiler.ProfilerActivity.CPU]
+            if torch.cuda.is_available():
+                activities.append(torch.profiler.ProfilerActivity.CUDA)
+            torch_prof = torch.profiler.profile(activities=activities)
+            torch_prof.__enter__()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            profile.dump_stats(str(base) + '.prof')
+            if torch_prof is not None:
+                torch_prof.__exit__(None, None, None)
+                torch_prof.export_chrome_trace(str(base) + '.torch.json')
+            self._deep.release()
+
+    def summary(self) -> str:
+        lines = [f"{'function':<24} {'calls':>8} {'total s':>10} {'mean ms':>10} {'max ms':>10}"]
+        with self.lock:
+            items = sorted(self.timings.items(), key=lambda x: -x[1][1])
+        for name, (calls, total, peak) in items:
+            lines.append(
+                f"{name:<24} {calls:>8} {total:>10.3f} {total / calls * 1000:>10.2f} {peak * 1000:>10.2f}"
+            )
+        return '\n'.join(lines)
+
+    def stop(self):
+        """Stop sampling and write timings and collapsed stacks to `out_dir`."""
+        self._stop.set()
+        if self._sampler:
+            self._sampler.join()
+
+        with open(self.out_dir / 'collapsed.txt', 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        with self.lock:
+            timings = {
+                name: {'calls': calls, 'total': total, 'max': peak}
+                for name, (calls, total, peak) in self.timings.items()
+            }
+        with open(self.out_dir / 'timings.json', 'w', encoding='utf-8') as f:
+            json.dump(timings, f, indent=2)
+
+        print(f"\nProfile written to {self.out_dir}/", file=sys.stderr)
+        print(self.summary(), file=sys.stderr)
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    """Add the --profile family of options to a command line parser."""
+    parser.add_argument('--profile', action='store_true',
+                      help='Time hot-path functions and sample stacks for a flamegraph')
+    parser.add_argument('--profile-dir', type=str, default='kokoro-profile',
+                      help='Directory for profile output (default: kokoro-profile)')
+    parser.add_argument('--profile-every', type=int, default=0,
+                      help='Dump a cProfile trace for every Nth request (default: never)')
+    parser.add_argument('--profile-torch', action='store_true',
+                      help='Also record torch profiler traces with --profile-every')
+
+def profiler_from_args(args) -> Optional[Profiler]:
+    """Create and start a profiler if --profile was given."""
+    if not args.profile:
+        return None
+    profiler = Profiler(
+        out_dir=args.profile_dir,
+        dump_every=args.profile_every,
+        torch_profile=args.profile_torch
+    )
+    profiler.start()
+    return profiler
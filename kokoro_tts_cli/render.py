@@ -0,0 +1,312 @@
+import os
+import sys
+import json
+import queue
+import shutil
+import hashlib
+import torch
+import argparse
+import threading
+import numpy as np
+from pathlib import Path
+from typing import List, Optional
+from . import streamer
+from .streamer import (
+    KOKORO_PATH,
+    build_model,
+    generate,
+    create_chunks,
+    pack_chunks,
+    load_voice
+)
+from .postprocess import ChunkJoiner, add_postprocess_arguments, joiner_settings_from_args
+from .lexicon import add_lexicon_arguments, lexicon_from_args
+
+SAMPLE_RATE = 24000
+
+class RenderJob:
+    """One text to render into one WAV file."""
+
+    def __init__(self, text_path: Optional[Path], output_path: Path, voice: str,
+                 speed: float, text: Optional[str] = None):
+        self.text_path = text_path
+        self.output_path = output_path
+        self.voice = voice
+        self.speed = speed
+        self.text = text
+        self.chunks = []
+        self.remaining = 0
+        self.failed = None
+        self.checkpoint_dir = None
+
+    def load_text(self) -> str:
+        if self.text is None:
+            self.text = self.text_path.read_text(encoding='utf-8')
+        return self.text
+
+    def key(self, pack: str = 'greedy') -> str:
+        """Identify the rendered content so stale checkpoints are never reused.
+
+        The output path is part of the key: jobs with identical content each
+        get their own checkpoints, which they delete when they finish.
+        """
+        digest = hashlib.sha1()
+        parts = [str(self.output_path.resolve()), self.load_text(), self.voice,
+                 repr(float(self.speed))]
+        if pack != 'greedy':
+            parts.append(pack)  # Different packing, different chunk boundaries
+        for part in parts:
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def chunk_path(self, index: int) -> Path:
+        return self.checkpoint_dir / f'{index:05d}.npy'
+
+def jobs_from_directory(input_dir: Path, output_dir: Path, voice: str, speed: float) -> List[RenderJob]:
+    """One job per *.txt file, written to output_dir/<name>.wav."""
+    return [
+        RenderJob(path, output_dir / f'{path.stem}.wav', voice, speed)
+        for path in sorted(input_dir.glob('*.txt'))
+    ]
+
+def jobs_from_manifest(manifest: Path, output_dir: Path, voice: str, speed: float) -> List[RenderJob]:
+    """Read a JSON lines manifest.
+
+    Each line has `text_path` (or inline `text`) and optionally
+    `output_path`, `voice` and `speed`. Relative paths are resolved
+    against the manifest's directory.
+    """
+    base = manifest.parent
+    jobs = []
+    with open(manifest, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            text_path = base / entry['text_path'] if 'text_path' in entry else None
+            if text_path is None and 'text' not in entry:
+                raise ValueError(f"{manifest}:{line_number}: needs 'text_path' or 'text'")
+            if 'output_path' in entry:
+                output_path = base / entry['output_path']
+            elif text_path is not None:
+                output_path = output_dir / f'{text_path.stem}.wav'
+            else:
+                output_path = output_dir / f'{line_number:05d}.wav'
+            jobs.append(RenderJob(
+                text_path,
+                output_path,
+                entry.get('voice', voice),
+                float(entry.get('speed', speed)),
+                text=entry.get('text')
+            ))
+    return jobs
+
+class Renderer:
+    """Render many texts with one model and a shared pool of workers.
+
+    Chunks of all jobs go through a single queue, so workers stay busy
+    across file boundaries. Every synthesized chunk is saved to the
+    checkpoint directory; an interrupted run picks up from there.
+    """
+
+    def __init__(self, model, device: str, workers: int = 2,
+                 checkpoint_root: Path = Path('.kokoro-render'),
+                 joiner_settings: Optional[dict] = None,
+                 keep_checkpoints: bool = False, verbose: bool = False,
+                 pack: str = 'greedy'):
+        self.model = model
+        self.device = device
+        self.workers = workers
+        self.checkpoint_root = checkpoint_root
+        self.joiner_settings = joiner_settings or {}
+        self.keep_checkpoints = keep_checkpoints
+        self.verbose = verbose
+        self.pack = pack
+        self.voices = {}
+        self.tasks = queue.Queue(maxsize=workers * 4)
+        self.lock = threading.Lock()
+        self.done_chunks = 0
+        self.resumed_chunks = 0
+        self.total_chunks = 0
+
+    def log(self, message: str):
+        if self.verbose:
+            print(message, file=sys.stderr)
+
+    def prepare(self, job: RenderJob):
+        """Chunk a job's text and queue the chunks not yet checkpointed."""
+        voicepack, primary_voice = load_voice(job.voice, self.device, self.voices)
+        lang = primary_voice[0]
+        if self.pack == 'optimal':
+            job.chunks, stats = pack_chunks(job.load_text(), lang)
+            self.log(f"{job.output_path}: packed into {stats}")
+        else:
+            job.chunks = create_chunks(job.load_text(), lang)
+        job.checkpoint_dir = self.checkpoint_root / job.key(self.pack)
+        job.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+        missing = [i for i in range(len(job.chunks)) if not job.chunk_path(i).exists()]
+        with self.lock:
+            job.remaining = len(missing)
+            self.total_chunks += len(job.chunks)
+            self.resumed_chunks += len(job.chunks) - len(missing)
+        if missing and len(missing) < len(job.chunks):
+            self.log(f"Resuming {job.output_path}: {len(job.chunks) - len(missing)}/"
+                     f"{len(job.chunks)} chunks already rendered")
+        if not missing:
+            self.finish(job)
+        for i in missing:
+            self.tasks.put((job, i, voicepack, lang))
+
+    def worker_loop(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                return
+            job, index, voicepack, lang = task
+            if job.failed:
+                continue
+            try:
+                audio, _ = generate(self.model, job.chunks[index], voicepack, lang, job.speed)
+                if audio is None:
+                    audio = np.zeros(0, dtype=np.float32)
+                # Write atomically so an interrupted save never looks complete
+                path = job.chunk_path(index)
+                tmp = path.with_name(path.stem + '.tmp.npy')
+                np.save(tmp, audio)
+                os.replace(tmp, path)
+            except Exception as e:
+                job.failed = str(e)
+                print(f"Error rendering {job.output_path} chunk {index + 1}: {e}", file=sys.stderr)
+                continue
+
+            with self.lock:
+                job.remaining -= 1
+                self.done_chunks += 1
+                last = job.remaining == 0
+                progress = f"[{self.done_chunks + self.resumed_chunks}/{self.total_chunks}]"
+            self.log(f"{progress} {job.output_path} chunk {index + 1}/{len(job.chunks)}")
+            if last:
+                try:
+                    self.finish(job)
+                except Exception as e:
+                    job.failed = str(e)
+                    print(f"Error writing {job.output_path}: {e}", file=sys.stderr)
+
+    def finish(self, job: RenderJob):
+        """Join the checkpointed chunks of a job into its WAV file."""
+        from scipy.io.wavfile import write as wavfile_write
+
+        joiner = ChunkJoiner(sample_rate=SAMPLE_RATE, **self.joiner_settings)
+        chunks = (np.load(job.chunk_path(i)) for i in range(len(job.chunks)))
+        pieces = list(joiner.process(chunks))
+        audio = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+
+        job.output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = job.output_path.with_name(job.output_path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            wavfile_write(f, SAMPLE_RATE, audio)
+        os.replace(tmp, job.output_path)
+        if not self.keep_checkpoints:
+            shutil.rmtree(job.checkpoint_dir, ignore_errors=True)
+        print(f"Wrote {job.output_path} ({len(audio) / SAMPLE_RATE:.1f}s)", file=sys.stderr)
+
+    def run(self, jobs: List[RenderJob]) -> int:
+        """Render all jobs, returning the number that failed."""
+        threads = [threading.Thread(target=self.worker_loop, daemon=True)
+                   for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        for job in jobs:
+            try:
+                self.prepare(job)
+            except Exception as e:
+                job.failed = str(e)
+                print(f"Error preparing {job.output_path}: {e}", file=sys.stderr)
+
+        for _ in threads:
+            self.tasks.put(None)
+        for thread in threads:
+            thread.join()
+        return sum(1 for job in jobs if job.failed)
+
+def run_render(argv: Optional[List[str]] = None):
+    """Entry point for `kokoro-tts render`."""
+    parser = argparse.ArgumentParser(
+        prog='kokoro-tts render',
+        description='Render a directory of .txt files or a JSONL manifest to WAV files'
+    )
+    parser.add_argument('input',
+                      help='Directory of .txt files or a JSONL manifest')
+    parser.add_argument('--output-dir', '-o', type=str, default='.',
+                      help='Where to write WAV files without an explicit output_path (default: .)')
+    parser.add_argument('--voice', default='af',
+                      help='Default voice or mix specification')
+    parser.add_argument('--speed', type=float, default=1.0,
+                      help='Default speech speed multiplier')
+    parser.add_argument('--workers', type=int, default=2,
+                      help='Chunks synthesized concurrently (default: 2)')
+    parser.add_argument('--torch-threads', type=int,
+                      help='Torch intra-op threads (default: cores divided by workers)')
+    parser.add_argument('--checkpoint-dir', type=str, default='.kokoro-render',
+                      help='Directory for per-chunk checkpoints (default: .kokoro-render)')
+    parser.add_argument('--keep-checkpoints', action='store_true',
+                      help='Keep chunk checkpoints after a file is written')
+    parser.add_argument('--force', action='store_true',
+                      help='Re-render files whose output already exists')
+    parser.add_argument('--pack', choices=['greedy', 'optimal'], default='greedy',
+                      help='Chunk packing: greedy (default) or optimal (fewest chunks, '
+                           'fewer inference calls)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                      help='Show per-chunk progress and packing statistics')
+    add_lexicon_arguments(parser)
+    add_postprocess_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        source = Path(args.input)
+        output_dir = Path(args.output_dir)
+        if source.is_dir():
+            jobs = jobs_from_directory(source, output_dir, args.voice, args.speed)
+        else:
+            jobs = jobs_from_manifest(source, output_dir, args.voice, args.speed)
+
+        if not args.force:
+            skipped = [job for job in jobs if job.output_path.exists()]
+            jobs = [job for job in jobs if not job.output_path.exists()]
+            if skipped:
+                print(f"Skipping {len(skipped)} files that already exist (use --force to redo)",
+                      file=sys.stderr)
+        if not jobs:
+            print("Nothing to render", file=sys.stderr)
+            return
+
+        streamer.LEXICON = lexicon_from_args(args)
+        torch.set_num_threads(args.torch_threads or max(1, (os.cpu_count() or 1) // args.workers))
+        device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        model = build_model(KOKORO_PATH / 'kokoro-v0_19.pth', device)
+
+        renderer = Renderer(
+            model,
+            device,
+            workers=args.workers,
+            checkpoint_root=Path(args.checkpoint_dir),
+            joiner_settings=joiner_settings_from_args(args),
+            keep_checkpoints=args.keep_checkpoints,
+            verbose=args.verbose,
+            pack=args.pack
+        )
+        print(f"Rendering {len(jobs)} files with {args.workers} workers...", file=sys.stderr)
+        failed = renderer.run(jobs)
+        if failed:
+            print(f"\n{failed} of {len(jobs)} files failed; rerun to resume", file=sys.stderr)
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        print("\nInterrupted by user; rerun the same command to resume", file=sys.stderr)
+        sys.exit(0)
+    except Exception as e:
+        print(f"\nError: {str(e)}", file=sys.stderr)
+        sys.exit(1)
@@ -2,31 +2,108 @@ import os
 import sys
 import socket
 import json
+import time
+import queue
 import torch
 import threading
 import argparse
+import tempfile
 from pathlib import Path
+from typing import Optional
+from contextlib import nullcontext
+from . import streamer
 from .streamer import (
     find_kokoro_path,
     build_model,
     generate,
+    phonemize,
     create_chunks
 )
+from .cancellation import CancellationToken, CancelledError, socket_closed
+from .coalesce import SingleFlight, voice_key
+from .codec import (
+    ENCODINGS, SAMPLE_RATE, AudioEncoder, output_sample_rate, send_frame, send_header
+)
+from .postprocess import ChunkJoiner, add_postprocess_arguments, joiner_settings_from_args
+from .metrics import Registry, MetricsServer, RequestTrace, TraceLog
+from .profiling import Profiler, add_profile_arguments, profiler_from_args
+from .prefork import PreforkServer
+from .lexicon import add_lexicon_arguments, lexicon_from_args
+from .jobs import Job, JobManager
+from .autotune import add_autotune_arguments, autotune, describe, record_tuning
 
 class KokoroTTSServer:
-    def __init__(self, host: str = 'localhost', port: int = 5000):
+    def __init__(self, host: str = 'localhost', port: int = 5000, workers: int = 4,
+                 metrics_port: Optional[int] = None, metrics_host: str = 'localhost',
+                 trace_log: Optional[str] = None, profiler: Optional[Profiler] = None,
+                 joiner_settings: Optional[dict] = None, coalesce: bool = True,
+                 spool_dir: Optional[str] = None, max_jobs: int = 2):
         self.host = host
         self.port = port
         self.server_socket = None
         self.model = None
         self.voices = {}
+        self.voices_lock = threading.Lock()
         self.running = False
-        
+        self.workers = workers
+        self.connections = queue.Queue()
+        self.fetches = queue.Queue()  # Job downloads handed over by handle_client
+        self.metrics_server = None
+        self.trace_log = TraceLog(trace_log) if trace_log else None
+        self.profiler = profiler
+        self.joiner_settings = joiner_settings or {}
+        self.inflight = SingleFlight() if coalesce else None
+
+        # Metrics
+        self.registry = Registry()
+        self.metrics_port = metrics_port
+        self.metrics_host = metrics_host
+        self.m_requests = self.registry.counter(
+            'kokoro_requests_total', 'Synthesis requests handled, by status')
+        self.m_chunks = self.registry.counter(
+            'kokoro_chunks_total', 'Text chunks synthesized')
+        self.m_audio_seconds = self.registry.counter(
+            'kokoro_audio_seconds_total', 'Seconds of audio produced')
+        self.m_bytes_sent = self.registry.counter(
+            'kokoro_bytes_sent_total', 'Audio bytes sent to clients, by encoding')
+        self.m_coalesced = self.registry.counter(
+            'kokoro_coalesced_chunks_total', 'Chunks served by joining an identical in-flight synthesis')
+        self.m_skipped = self.registry.counter(
+            'kokoro_chunks_skipped_total', 'Chunks not synthesized because the request was cancelled')
+        self.m_cache = self.registry.counter(
+            'kokoro_cache_requests_total', 'Cache lookups, by cache and result')
+        self.m_active = self.registry.gauge(
+            'kokoro_active_connections', 'Connections currently being served')
+        self.m_queued = self.registry.gauge(
+            'kokoro_queued_connections', 'Accepted connections waiting for a worker')
+        self.m_queue_wait = self.registry.histogram(
+            'kokoro_queue_wait_seconds', 'Time from accept until a worker picks up the connection')
+        self.m_stage = self.registry.histogram(
+            'kokoro_stage_seconds', 'Time spent per request in each pipeline stage')
+        self.m_inference = self.registry.histogram(
+            'kokoro_chunk_inference_seconds', 'Model inference time per chunk')
+        self.m_latency = self.registry.histogram(
+            'kokoro_request_seconds', 'Total time to handle a request')
+        self.m_rtf = self.registry.histogram(
+            'kokoro_realtime_factor',
+            'Seconds of audio produced per second of synthesis (higher is faster)',
+            buckets=(0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0))
+
+        # Background jobs render into the spool directory without a client attached
+        self.jobs = None
+        if spool_dir and max_jobs > 0:
+            self.jobs = JobManager(Path(spool_dir), self.render_job, max_concurrent=max_jobs,
+                                   registry=self.registry)
+
         # Initialize model
         device = 'cuda' if torch.cuda.is_available() else 'cpu'
         kokoro_path = find_kokoro_path()
         self.model = build_model(kokoro_path / 'kokoro-v0_19.pth', device)
         self.voices_dir = kokoro_path / 'voices'
+
+        if streamer.LEXICON is not None:
+            streamer.LEXICON.on_lookup = lambda hit: self.m_cache.inc(
+                cache='phonemes', result='hit' if hit else 'miss')
         
     def load_voice(self, voice_spec: str) -> tuple:
         device = 'cuda' if torch.cuda.is_available() else 'cpu'
@@ -36,11 +113,7 @@ class KokoroTTSServer:
             for part in voice_spec.split(','):
                 name, weight = part.split(':')
                 weight = float(weight)
-                if name not in self.voices:
-                    self.voices[name] = torch.load(
-                        self.voices_dir / f'{name}.pt',
-                        weights_only=True
-                    ).to(device)
+                self._load_single_voice(name, device)
                 voice_mix[name] = weight
             
             mixed_voice = sum(
@@ -50,92 +123,400 @@ class KokoroTTSServer:
             primary_voice = max(voice_mix.items(), key=lambda x: x[1])[0]
             return mixed_voice, primary_voice
         else:
-            if voice_spec not in self.voices:
-                self.voices[voice_spec] = torch.load(
-                    self.voices_dir / f'{voice_spec}.pt',
+            return self._load_single_voice(voice_spec, device), voice_spec
+
+    def preload_voices(self):
+        """Load every voicepack up front, e.g. before forking workers."""
+        device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        for path in sorted(self.voices_dir.glob('*.pt')):
+            self._load_single_voice(path.stem, device)
+
+    def _load_single_voice(self, name: str, device: str):
+        with self.voices_lock:
+            if name in self.voices:
+                self.m_cache.inc(cache='voice', result='hit')
+            else:
+                self.m_cache.inc(cache='voice', result='miss')
+                self.voices[name] = torch.load(
+                    self.voices_dir / f'{name}.pt',
                     weights_only=True
                 ).to(device)
-            return self.voices[voice_spec], voice_spec
+            return self.voices[name]
 
-    def handle_client(self, client_socket: socket.socket):
+    def handle_client(self, client_socket: socket.socket, accepted_at: Optional[float] = None):
         """Handle individual client connection."""
+        started = time.perf_counter()
+        if accepted_at is not None:
+            self.m_queue_wait.observe(started - accepted_at)
+        self.m_active.inc()
+
+        trace = RequestTrace()
+        status = 'error'
+        framed = False
+        header_sent = False
+        detached = False
+        op = 'synthesize'
         try:
             # Receive the request data
-            request_data = b''
-            while True:
-                chunk = client_socket.recv(4096)
-                if not chunk:
-                    break
-                request_data += chunk
-                
-                try:
-                    request = json.loads(request_data.decode())
-                    break  # Valid JSON received
-                except json.JSONDecodeError:
-                    continue  # Keep reading until we have complete JSON
-            
+            with trace.stage('receive'):
+                request_data = b''
+                while True:
+                    chunk = client_socket.recv(4096)
+                    if not chunk:
+                        break
+                    request_data += chunk
+
+                    try:
+                        request = json.loads(request_data.decode())
+                        break  # Valid JSON received
+                    except json.JSONDecodeError:
+                        continue  # Keep reading until we have complete JSON
+
+            op = request.get('op', 'synthesize')
             text = request.get('text', '')
             voice_spec = request.get('voice', 'af')
             speed = request.get('speed', 1.0)
-            
+            encoding = request.get('encoding')
+            if op == 'fetch' and encoding is None:
+                encoding = 'int16'
+            trace.info.update(op=op, chars=len(text), voice=voice_spec, speed=speed, encoding=encoding)
+
+            # Stop synthesizing as soon as the client goes away. Clients may
+            # half-close after the request, so a client that gave up while
+            # queued is only noticed once the first response bytes reach it.
+            token = CancellationToken()
+            token.add_check(lambda: socket_closed(client_socket), reason='client disconnected')
+            token.raise_if_cancelled()
+
+            # Requests naming an encoding get a framed response with a header;
+            # legacy requests get raw float32 samples. Job requests are always framed.
+            if encoding is not None or op != 'synthesize':
+                framed = True
+            if encoding is not None and encoding not in ENCODINGS:
+                raise ValueError(
+                    f"Unsupported encoding '{encoding}' (choose from {', '.join(ENCODINGS)})"
+                )
+
+            if op != 'synthesize':
+                header, stream = self.job_response(op, request, token)
+                trace.info['job_id'] = header.get('job_id')
+                send_header(client_socket, **header)
+                header_sent = True
+                if stream is not None:
+                    # Following a running job mostly waits for the renderer,
+                    # so it goes to the fetch pool instead of holding a
+                    # synthesis worker
+                    self.fetches.put(
+                        (client_socket, stream, encoding, trace, started, accepted_at)
+                    )
+                    detached = True
+                    return
+                status = 'ok'
+                return
+
+            voicepack, lang, chunks = self.prepare_text(text, voice_spec, trace)
+
+            if framed:
+                send_header(
+                    client_socket,
+                    sample_rate=output_sample_rate(encoding),
+                    encoding=encoding,
+                    channels=1
+                )
+                header_sent = True
+
+            # Generate and stream audio chunk by chunk
+            audio_seconds = 0.0
+            encoder = AudioEncoder(encoding or 'float32')
+            for audio in self.synthesize_chunks(chunks, voicepack, lang, voice_spec, speed,
+                                                trace, token):
+                audio_seconds += len(audio) / SAMPLE_RATE
+                self._send_audio(client_socket, audio, encoder, framed, trace)
+            self._send_audio(client_socket, None, encoder, framed, trace)
+
+            if framed:
+                send_frame(client_socket, b'')
+
+            self._record_synthesis(trace, len(chunks), audio_seconds)
+            status = 'ok'
+
+        except (CancelledError, ConnectionResetError, BrokenPipeError) as e:
+            # Includes clients that hang up while audio is being sent
+            status = 'cancelled'
+            trace.info['error'] = str(e) or 'client disconnected'
+        except Exception as e:
+            trace.info['error'] = str(e)
+            print(f"Error handling client: {e}")
+            if framed and not header_sent:
+                # The client is still waiting for a header, so report the error there
+                try:
+                    send_header(client_socket, error=str(e))
+                except OSError:
+                    pass
+        finally:
+            if not detached:
+                self._finish_request(client_socket, trace, status, op, started, accepted_at)
+
+    def _serve_fetch(self, client_socket: socket.socket, stream, encoding: str,
+                     trace: RequestTrace, started: float, accepted_at: Optional[float]):
+        """Send a job's audio from the spool; runs on the fetch pool."""
+        status = 'error'
+        try:
+            encoder = AudioEncoder(encoding)
+            for audio in stream:
+                self._send_audio(client_socket, audio, encoder, True, trace)
+            self._send_audio(client_socket, None, encoder, True, trace)
+            send_frame(client_socket, b'')
+            status = 'ok'
+        except (CancelledError, ConnectionResetError, BrokenPipeError) as e:
+            status = 'cancelled'
+            trace.info['error'] = str(e) or 'client disconnected'
+        except Exception as e:
+            # The header is already sent; the client sees the missing end frame
+            trace.info['error'] = str(e)
+            print(f"Error handling client: {e}")
+        finally:
+            self._finish_request(client_socket, trace, status, 'fetch', started, accepted_at)
+
+    def _finish_request(self, client_socket: socket.socket, trace: RequestTrace, status: str,
+                        op: str, started: float, accepted_at: Optional[float]):
+        client_socket.close()
+        self.m_active.dec()
+        self.m_requests.inc(status=status)
+        for name, seconds in trace.stages.items():
+            self.m_stage.observe(seconds, stage=name)
+        total = time.perf_counter() - started
+        if op == 'synthesize':
+            # Job polls and downloads would skew synthesis latency
+            self.m_latency.observe(total)
+        if self.trace_log:
+            trace.info.update(
+                status=status,
+                total=round(total, 6),
+                queue_wait=round(started - accepted_at, 6) if accepted_at is not None else None
+            )
+            self.trace_log.write(trace)
+
+    def prepare_text(self, text: str, voice_spec: str, trace: RequestTrace) -> tuple:
+        """Load the voice and split the text, returning (voicepack, lang, chunks)."""
+        with trace.stage('voice'):
             voicepack, primary_voice = self.load_voice(voice_spec)
-            lang = primary_voice[0]
-            
-            # Process text
+        lang = primary_voice[0]
+
+        # Process text
+        with trace.stage('chunking'):
             chunks = create_chunks(text, lang)
-            
-            # Generate audio for all chunks
-            audio = None
-            for chunk in chunks:
-                chunk_audio, _ = generate(
-                    self.model,
-                    chunk,
-                    voicepack,
-                    lang,
-                    speed
+        return voicepack, lang, chunks
+
+    def synthesize_chunks(self, chunks: list, voicepack, lang: str, voice_spec: str,
+                          speed: float, trace: RequestTrace, token: CancellationToken,
+                          on_chunk=None):
+        """Synthesize chunks in order, yielding the joined audio as it is ready."""
+        joiner = ChunkJoiner(sample_rate=SAMPLE_RATE, **self.joiner_settings)
+        for i, chunk in enumerate(chunks):
+            if token.cancelled:
+                self.m_skipped.inc(len(chunks) - i)
+                token.raise_if_cancelled()
+            def synthesize(chunk=chunk):
+                with trace.stage('phonemize'):
+                    ps = phonemize(chunk, lang)
+                with trace.stage('inference'):
+                    audio, _ = generate(
+                        self.model,
+                        chunk,
+                        voicepack,
+                        lang,
+                        speed,
+                        ps=ps
+                    )
+                return audio
+
+            inference_start = time.perf_counter()
+            if self.inflight is not None:
+                # Identical chunks requested concurrently share one inference
+                chunk_audio, shared = self.inflight.do(
+                    (chunk, voice_key(voice_spec), float(speed)), synthesize, token
                 )
-                if chunk_audio is not None:
-                    if audio is None:
-                        audio = chunk_audio
-                    else:
-                        audio = np.concatenate([audio, chunk_audio])
-            
-            # Send audio data
-            if audio is not None:
-                client_socket.sendall(audio.tobytes())
-                
+            else:
+                chunk_audio, shared = synthesize(), False
+            inference_time = time.perf_counter() - inference_start
+            if shared:
+                trace.add('coalesce_wait', inference_time)
+                self.m_coalesced.inc()
+            else:
+                trace.chunk_inference.append(inference_time)
+                self.m_inference.observe(inference_time)
+                self.m_chunks.inc()
+            if chunk_audio is not None:
+                with trace.stage('postprocess'):
+                    chunk_audio = joiner.push(chunk_audio)
+                if len(chunk_audio):
+                    yield chunk_audio
+            # Resumed only after the consumer has handled this chunk's audio
+            if on_chunk:
+                on_chunk()
+
+        # The end of the last chunk is held back for crossfading
+        tail = joiner.flush()
+        if len(tail):
+            yield tail
+
+    def _record_synthesis(self, trace: RequestTrace, chunks: int, audio_seconds: float):
+        synthesis_time = trace.stages.get('phonemize', 0.0) + trace.stages.get('inference', 0.0)
+        self.m_audio_seconds.inc(audio_seconds)
+        if audio_seconds > 0 and synthesis_time > 0:
+            self.m_rtf.observe(audio_seconds / synthesis_time)
+        trace.info.update(chunks=chunks, audio_seconds=round(audio_seconds, 3))
+
+    def render_job(self, job: Job, token: CancellationToken, on_progress):
+        """Render a background job; called from the job manager's threads."""
+        trace = RequestTrace(op='job', job_id=job.id, chars=len(job.text),
+                             voice=job.voice, speed=job.speed)
+        status = 'error'
+
+        def on_chunk():
+            job.chunks_done += 1
+            on_progress()
+
+        try:
+            voicepack, lang, chunks = self.prepare_text(job.text, job.voice, trace)
+            job.chunks_total = len(chunks)
+            on_progress()
+            audio_seconds = 0.0
+            for audio in self.synthesize_chunks(chunks, voicepack, lang, job.voice, job.speed,
+                                                trace, token, on_chunk):
+                audio_seconds += len(audio) / SAMPLE_RATE
+                yield audio
+            self._record_synthesis(trace, len(chunks), audio_seconds)
+            status = 'ok'
+        except CancelledError as e:
+            status = 'cancelled'
+            trace.info['error'] = str(e)
+            raise
         except Exception as e:
-            print(f"Error handling client: {e}")
+            trace.info['error'] = str(e)
+            raise
         finally:
-            client_socket.close()
+            for name, seconds in trace.stages.items():
+                self.m_stage.observe(seconds, stage=name)
+            if self.trace_log:
+                trace.info.update(status=status, total=round(time.time() - trace.started, 6))
+                self.trace_log.write(trace)
 
+    def job_response(self, op: str, request: dict, token: CancellationToken) -> tuple:
+        """Answer a job request with (header fields, audio stream or None)."""
+        if self.jobs is None:
+            raise ValueError("Background jobs are disabled on this server")
+        if op == 'submit':
+            text = request.get('text', '')
+            if not text.strip():
+                raise ValueError("Job has no text")
+            job = self.jobs.submit(text, request.get('voice', 'af'), request.get('speed', 1.0))
+            return job.to_dict(), None
+        job_id = request.get('job_id')
+        if op == 'status':
+            return self.jobs.status(job_id), None
+        if op == 'cancel':
+            return self.jobs.cancel(job_id), None
+        if op == 'fetch':
+            status = self.jobs.status(job_id)
+            if status['status'] in ('failed', 'cancelled'):
+                raise RuntimeError(f"Job {status['status']}: {status['message']}")
+            encoding = request.get('encoding') or 'int16'
+            header = dict(job_id=job_id, sample_rate=output_sample_rate(encoding),
+                          encoding=encoding, channels=1)
+            return header, self.jobs.stream(job_id, token)
+        raise ValueError(f"Unknown op '{op}'")
 
-    def start(self):
+    def _send_audio(self, client_socket: socket.socket, audio, encoder: AudioEncoder,
+                    framed: bool, trace: RequestTrace):
+        """Encode and send one piece of audio; None sends what the encoder still holds."""
+        with trace.stage('encode'):
+            data = encoder.encode(audio) if audio is not None else encoder.flush()
+        if not data:
+            return
+        with trace.stage('send'):
+            if framed:
+                send_frame(client_socket, data)
+            else:
+                client_socket.sendall(data)
+        self.m_bytes_sent.inc(len(data), encoding=encoder.encoding)
+
+    def worker_loop(self):
+        """Serve queued connections until the server stops."""
+        while True:
+            item = self.connections.get()
+            if item is None:
+                return
+            client_socket, accepted_at = item
+            self.m_queued.dec()
+            with self.profiler.request() if self.profiler else nullcontext():
+                self.handle_client(client_socket, accepted_at)
+
+    def fetch_loop(self):
+        """Serve queued job downloads until the server stops."""
+        while True:
+            item = self.fetches.get()
+            if item is None:
+                return
+            self._serve_fetch(*item)
+
+    def bind(self):
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.server_socket.bind((self.host, self.port))
-        self.server_socket.listen(5)
+        self.server_socket.listen(128)
+
+    def start_metrics(self, registry=None):
+        if self.metrics_port is not None:
+            self.metrics_server = MetricsServer(
+                registry or self.registry, self.metrics_host, self.metrics_port
+            )
+            self.metrics_server.start()
+            print(f"Metrics available at http://{self.metrics_host}:{self.metrics_port}/metrics")
+
+    def serve(self):
+        """Accept connections on the bound socket until the server stops."""
         self.running = True
-        
-        print(f"KokoroTTS Server running on {self.host}:{self.port}")
-        
+
+        # A fixed pool of workers serves connections from a queue so a burst
+        # of clients cannot spawn an unbounded number of inference threads
+        for _ in range(self.workers):
+            threading.Thread(target=self.worker_loop, daemon=True).start()
+        # Downloads get a pool of the same size, so they cannot starve
+        # synthesis and a burst of them waits in the queue
+        for _ in range(self.workers):
+            threading.Thread(target=self.fetch_loop, daemon=True).start()
+
         while self.running:
             try:
                 client_socket, addr = self.server_socket.accept()
                 print(f"New connection from {addr}")
-                client_thread = threading.Thread(
-                    target=self.handle_client,
-                    args=(client_socket,)
-                )
-                client_thread.start()
+                self.m_queued.inc()
+                self.connections.put((client_socket, time.perf_counter()))
             except Exception as e:
                 if self.running:
                     print(f"Error accepting connection: {e}")
 
+    def start(self):
+        self.bind()
+        self.start_metrics()
+        print(f"KokoroTTS Server running on {self.host}:{self.port} ({self.workers} workers)")
+        self.serve()
+
     def stop(self):
         self.running = False
         if self.server_socket:
             self.server_socket.close()
+        for _ in range(self.workers):
+            self.connections.put(None)
+            self.fetches.put(None)
+        if self.metrics_server:
+            self.metrics_server.stop()
+        if self.trace_log:
+            self.trace_log.close()
+        if self.profiler:
+            self.profiler.stop()
 
 def run_server():
     parser = argparse.ArgumentParser(description='Kokoro TTS Server')
@@ -145,14 +526,103 @@ def run_server():
                       help='Server port (default: 5000)')
     parser.add_argument('--kokoro-path', type=str,
                       help='Path to Kokoro-82M directory')
+    parser.add_argument('--workers', type=int, default=4,
+                      help='Number of connections synthesized concurrently per process (default: 4)')
+    parser.add_argument('--processes', type=int,
+                      help='Fork this many worker processes sharing the model (default: 1, '
+                           'or the autotuned count)')
+    parser.add_argument('--torch-threads', type=int,
+                      help='Torch intra-op threads per process (default: torch default)')
+    parser.add_argument('--metrics-port', type=int,
+                      help='Serve Prometheus metrics on this port (default: disabled)')
+    parser.add_argument('--metrics-host', default='localhost',
+                      help='Metrics endpoint host (default: localhost)')
+    parser.add_argument('--trace-log', type=str,
+                      help='Append a JSON timing trace per request to this file')
+    parser.add_argument('--no-coalesce', action='store_false', dest='coalesce',
+                      help='Synthesize identical concurrent chunks separately')
+    parser.add_argument('--spool-dir', type=str,
+                      default=os.path.join(tempfile.gettempdir(), 'kokoro-tts-jobs'),
+                      help='Directory where background jobs write their audio')
+    parser.add_argument('--max-jobs', type=int, default=2,
+                      help='Background jobs rendered concurrently per process; 0 disables jobs (default: 2)')
+    add_lexicon_arguments(parser)
+    add_postprocess_arguments(parser)
+    add_profile_arguments(parser)
+    add_autotune_arguments(parser)
     args = parser.parse_args()
 
     if args.kokoro_path:
         os.environ['KOKORO_PATH'] = args.kokoro_path
-        
-    server = KokoroTTSServer(host=args.host, port=args.port)
+    streamer.LEXICON = lexicon_from_args(args)
+
+    server = KokoroTTSServer(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        metrics_port=args.metrics_port,
+        metrics_host=args.metrics_host,
+        trace_log=args.trace_log,
+        joiner_settings=joiner_settings_from_args(args),
+        coalesce=args.coalesce,
+        spool_dir=args.spool_dir,
+        max_jobs=args.max_jobs
+    )
+
+    processes = args.processes or 1
+    torch_threads = args.torch_threads
+    tuning = None
+    if args.autotune or args.autotune_refresh:
+        if torch.cuda.is_available():
+            print("Autotune skipped: only CPU inference is tuned", file=sys.stderr)
+        else:
+            voicepack, primary_voice = server.load_voice('af')
+            tuning = autotune(
+                streamer.benchmark_chunk(server.model, voicepack, primary_voice[0]),
+                mode='server',
+                streams=args.processes,
+                workers=args.workers,
+                duration=args.autotune_seconds,
+                refresh=args.autotune_refresh
+            )
+            print(f"Autotune: {describe(tuning)}")
+            processes = tuning['streams']
+            torch_threads = args.torch_threads or tuning['threads']
+
+    prefork = processes > 1
+    if prefork and torch_threads is None:
+        # Split the cores between workers instead of letting each use all of them
+        torch_threads = max(1, (os.cpu_count() or 1) // processes)
+    if torch_threads:
+        torch.set_num_threads(torch_threads)
+    if not prefork:
+        server.profiler = profiler_from_args(args)
+
+    def install_profiler(server, index=None):
+        if index is not None:
+            # Each worker process profiles into its own directory
+            args.profile_dir = os.path.join(args.profile_dir, f'worker-{index}')
+            server.profiler = profiler_from_args(args)
+        if server.profiler:
+            server.profiler.install(sys.modules[__name__])
+            server.profiler.install(streamer)
+
     try:
         print("Starting Kokoro TTS Server - Press Ctrl+C to stop")
+        if prefork:
+            if streamer.LEXICON is not None:
+                # Each worker opens its own connections; none may cross the fork
+                streamer.LEXICON.close()
+            server = PreforkServer(
+                server,
+                processes=processes,
+                torch_threads=torch_threads,
+                worker_init=install_profiler
+            )
+        else:
+            install_profiler(server)
+        if tuning:
+            record_tuning(server.registry, tuning)
         server.start()
     except KeyboardInterrupt:
         print("\nShutting down server...")
@@ -0,0 +1,56 @@
+import bisect
+import hashlib
+from typing import Iterator, List, Sequence, Tuple
+
+Endpoint = Tuple[str, int]
+
+def parse_endpoints(spec: str, default_port: int = 5000) -> List[Endpoint]:
+    """Parse "host1:port1,host2,host3:port3" into (host, port) pairs."""
+    endpoints = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if ':' in part:
+            host, port = part.rsplit(':', 1)
+            endpoints.append((host, int(port)))
+        else:
+            endpoints.append((part, default_port))
+    if not endpoints:
+        raise ValueError("No server endpoints given")
+    return endpoints
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode('utf-8')).digest()[:8], 'big')
+
+class HashRing:
+    """Consistent hash ring mapping keys to server endpoints.
+
+    Each endpoint is placed on the ring `replicas` times so load spreads
+    evenly, and adding or removing a server only moves the keys that
+    belonged to it.
+    """
+
+    def __init__(self, endpoints: Sequence[Endpoint], replicas: int = 100):
+        self.endpoints = list(dict.fromkeys(endpoints))
+        self.ring = sorted(
+            (_hash(f"{host}:{port}#{i}"), (host, port))
+            for host, port in self.endpoints
+            for i in range(replicas)
+        )
+        self.points = [point for point, _ in self.ring]
+
+    def nodes_for(self, key: str) -> Iterator[Endpoint]:
+        """Yield every endpoint once, starting with the owner of `key`.
+
+        Later endpoints are the failover order for that key.
+        """
+        seen = set()
+        start = bisect.bisect(self.points, _hash(key))
+        for i in range(len(self.ring)):
+            endpoint = self.ring[(start + i) % len(self.ring)][1]
+            if endpoint not in seen:
+                seen.add(endpoint)
+                yield endpoint
+                if len(seen) == len(self.endpoints):
+                    return
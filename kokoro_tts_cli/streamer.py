@@ -7,6 +7,7 @@ import os
 import sys
 import queue
 import time
+import threading
 import curses
 import argparse
 import sounddevice as sd
@@ -14,6 +15,13 @@ import numpy as np
 import re
 from typing import List, Tuple, Optional, Iterator
 from pathlib import Path
+from .profiling import add_profile_arguments, profiler_from_args
+from .cancellation import CancellationToken
+from .postprocess import ChunkJoiner, add_postprocess_arguments, joiner_settings_from_args
+from .packing import PackStats, pack_sentences
+from .lexicon import PhonemeLexicon, add_lexicon_arguments, lexicon_from_args
+from .lookahead import RenderBuffer
+from .autotune import BENCHMARK_TEXT, add_autotune_arguments, autotune, describe
 
 def process_text_stream(text_iterator: Iterator[str]) -> Iterator[str]:
     """Process text into meaningful chunks (sentences/paragraphs)."""
@@ -67,16 +75,36 @@ sys.path.append(str(KOKORO_PATH))
 # Now import from Kokoro
 from models import build_model
 import torch
-from kokoro import generate, phonemize, tokenize
+import kokoro
+from kokoro import tokenize
+
+# Persistent phoneme cache consulted before espeak; set by the command line tools
+LEXICON: Optional[PhonemeLexicon] = None
+
+def phonemize(text: str, lang='a') -> str:
+    """Phonemize text, using the lexicon when one is configured."""
+    if LEXICON is None:
+        return kokoro.phonemize(text, lang)
+    return LEXICON.lookup(lang, text, kokoro.phonemize)
+
+def generate(model, text: str, voicepack, lang='a', speed=1, ps: Optional[str] = None):
+    """kokoro.generate, phonemizing through the lexicon unless `ps` is given."""
+    if ps is None:
+        ps = phonemize(text, lang)
+    return kokoro.generate(model, text, voicepack, lang, speed, ps=ps)
 
 def split_into_sentences(text: str) -> List[str]:
     """Split text into sentences at natural boundaries."""
     sentences = re.split(r'(?<=[.!?])\s+(?=[A-Z])', text)
     return [s.strip() for s in sentences if s.strip()]
 
-def get_chunk_tokens(text: str, lang='a') -> List[int]:
-    """Get actual token count for a piece of text."""
-    ps = phonemize(text, lang)
+def get_chunk_tokens(text: str, lang='a', cache: bool = True) -> List[int]:
+    """Get actual token count for a piece of text.
+
+    With `cache=False` the lexicon is skipped, for throwaway probes such as
+    the growing prefixes tried while splitting a long sentence.
+    """
+    ps = phonemize(text, lang) if cache else kokoro.phonemize(text, lang)
     return tokenize(ps)
 
 def split_long_sentence(sentence: str, lang='a', max_tokens: int = 450) -> List[str]:
@@ -102,12 +130,13 @@ def split_long_sentence(sentence: str, lang='a', max_tokens: int = 450) -> List[
             
             for part in parts:
                 test_chunk = (separator if current_chunk else '') + part
-                test_tokens = get_chunk_tokens(' '.join(current_chunk) + test_chunk, lang)
+                # Candidate splits are not worth keeping in the lexicon
+                test_tokens = get_chunk_tokens(' '.join(current_chunk) + test_chunk, lang, cache=False)
                 
                 if len(test_tokens) > max_tokens and current_chunk:
                     chunks.append(' '.join(current_chunk))
                     current_chunk = [part]
-                    current_tokens = get_chunk_tokens(part, lang)
+                    current_tokens = get_chunk_tokens(part, lang, cache=False)
                 else:
                     current_chunk.append(test_chunk)
                     current_tokens = test_tokens
@@ -118,7 +147,7 @@ def split_long_sentence(sentence: str, lang='a', max_tokens: int = 450) -> List[
             # Verify all chunks are within token limit
             valid_chunks = True
             for chunk in chunks:
-                if len(get_chunk_tokens(chunk, lang)) > max_tokens:
+                if len(get_chunk_tokens(chunk, lang, cache=False)) > max_tokens:
                     valid_chunks = False
                     break
             
@@ -133,13 +162,14 @@ def split_long_sentence(sentence: str, lang='a', max_tokens: int = 450) -> List[
     
     for word in words:
         test_chunk = ' '.join(current_chunk + [word])
-        test_tokens = get_chunk_tokens(test_chunk, lang)
+        # Every growing prefix is measured; keep them out of the lexicon
+        test_tokens = get_chunk_tokens(test_chunk, lang, cache=False)
         
         if len(test_tokens) > max_tokens:
             if current_chunk:
                 chunks.append(' '.join(current_chunk) + '...')
                 current_chunk = ['...', word]
-                current_tokens = get_chunk_tokens(' '.join(current_chunk), lang)
+                current_tokens = get_chunk_tokens(' '.join(current_chunk), lang, cache=False)
             else:
                 print(f"Warning: Word '{word}' exceeds token limit and will be truncated")
                 chunks.append(word[:int(len(word) * (max_tokens / len(test_tokens)))] + '...')
@@ -190,9 +220,69 @@ def create_chunks(text: str, lang='a', max_tokens: int = 450) -> List[str]:
     
     return chunks
 
+def pack_chunks(text: str, lang='a', max_tokens: int = 450) -> Tuple[List[str], PackStats]:
+    """Split text into the fewest chunks that fit within the token limit.
+
+    Slower to plan than `create_chunks` but saves inference calls, so it
+    is meant for offline renders rather than streaming.
+    """
+    return pack_sentences(
+        split_into_sentences(text),
+        lambda piece: len(get_chunk_tokens(piece, lang)),
+        max_tokens
+    )
+
+def benchmark_chunk(model, voicepack, lang='a'):
+    """Return a function synthesizing the autotune benchmark text once.
+
+    The text is phonemized up front so only inference is measured; the
+    function returns the seconds of audio produced.
+    """
+    ps = phonemize(BENCHMARK_TEXT, lang)
+    if LEXICON is not None:
+        LEXICON.close()  # The benchmark runs in forked processes
+
+    def run_chunk() -> float:
+        audio, _ = generate(model, BENCHMARK_TEXT, voicepack, lang, 1.0, ps=ps)
+        return len(audio) / 24000 if audio is not None else 0.0
+    return run_chunk
+
+def load_voice(voice_spec: str, device: str, cache: Optional[dict] = None):
+    """Load a voicepack or weighted mix (e.g. "af_bella:0.7,bf_emma:0.3").
+
+    Returns the voicepack and the name of the primary (heaviest) voice.
+    Loaded voices are kept in `cache` when one is given.
+    """
+    voices_dir = KOKORO_PATH / 'voices'
+    cache = {} if cache is None else cache
+
+    def load(name):
+        if name not in cache:
+            voice_path = voices_dir / f'{name}.pt'
+            if not voice_path.exists():
+                raise FileNotFoundError(
+                    f"Voice '{name}' not found.\n"
+                    f"Available voices:\n"
+                    f"  {', '.join(v.stem for v in voices_dir.glob('*.pt'))}"
+                )
+            cache[name] = torch.load(voice_path, weights_only=True).to(device)
+        return cache[name]
+
+    if ':' in voice_spec:  # Voice mix specification
+        voice_mix = {}
+        for part in voice_spec.split(','):
+            name, weight = part.split(':')
+            voice_mix[name] = float(weight)
+        mixed_voice = sum(load(name) * weight for name, weight in voice_mix.items())
+        primary_voice = max(voice_mix.items(), key=lambda x: x[1])[0]
+        return mixed_voice, primary_voice
+
+    return load(voice_spec), voice_spec
+
 class AudioStreamer:
     def __init__(self, sample_rate=24000, save_path: Optional[str] = None, 
-                 play_audio: bool = True, output_raw: bool = False):
+                 play_audio: bool = True, output_raw: bool = False,
+                 joiner: Optional[ChunkJoiner] = None):
         self.sample_rate = sample_rate
         self.audio_queue = queue.Queue()
         self.current_audio = None
@@ -205,6 +295,11 @@ class AudioStreamer:
         self.all_audio = [] if save_path else None
         self.play_audio_flag = play_audio
         self.output_raw = output_raw
+        self.joiner = joiner
+        self.lock = threading.Lock()
+        # Label of the audio being heard, e.g. a sentence index; see play_audio
+        self.current_mark = None
+        self.pending_mark = None
         
     def callback(self, outdata, frames, time, status):
         if self.is_paused:
@@ -213,27 +308,46 @@ class AudioStreamer:
             
         try:
             if self.current_audio is None:
-                self.current_audio = self.audio_queue.get_nowait()
+                self.current_audio, mark = self.audio_queue.get_nowait()
+                if mark is not None:
+                    self.current_mark = mark
             
             chunk_size = len(outdata)
             if len(self.current_audio) < chunk_size:
                 outdata[:len(self.current_audio)] = self.current_audio.reshape(-1, 1)
                 outdata[len(self.current_audio):] = 0
                 self.current_audio = None
-                if self.audio_queue.empty():
-                    self.finished = True
-                    raise sd.CallbackStop()
+                self._stop_if_drained()
             else:
                 outdata[:] = self.current_audio[:chunk_size].reshape(-1, 1)
                 self.current_audio = self.current_audio[chunk_size:]
                 
         except queue.Empty:
             outdata[:] = 0
-            self.finished = True
             self.current_audio = None
-            raise sd.CallbackStop()
+            self._stop_if_drained()
+
+    def _stop_if_drained(self):
+        # Under the lock so audio queued meanwhile either gets played by this
+        # stream or sees is_playing False and starts a new one
+        with self.lock:
+            if self.audio_queue.empty():
+                self.finished = True
+                self.is_playing = False
+                raise sd.CallbackStop()
     
-    def play_audio(self, audio):
+    def play_audio(self, audio, mark=None):
+        """Queue audio for playback; `current_mark` becomes `mark` once it is heard."""
+        if mark is not None:
+            # Kept until audio actually gets queued, as the joiner may hold it all back
+            self.pending_mark = mark
+        if self.joiner is not None:
+            audio = self.joiner.push(audio)
+            if len(audio) == 0:
+                return
+        self._enqueue(audio)
+
+    def _enqueue(self, audio):
         if self.speed_multiplier != 1.0:
             from scipy import signal
             audio = signal.resample(audio, int(len(audio) / self.speed_multiplier))
@@ -248,17 +362,24 @@ class AudioStreamer:
         if not self.play_audio_flag:
             return
             
-        self.finished = False
-        self.audio_queue.put(audio)
-        
-        if not self.is_playing:
-            self.stream = sd.OutputStream(
-                samplerate=self.sample_rate,
-                channels=1,
-                callback=self.callback
-            )
-            self.stream.start()
+        with self.lock:
+            self.finished = False
+            self.audio_queue.put((audio, self.pending_mark))
+            self.pending_mark = None
+            if self.is_playing:
+                return
             self.is_playing = True
+
+        # Playback ran dry (or never started): finish the old stream and start over
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+        self.stream = sd.OutputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            callback=self.callback
+        )
+        self.stream.start()
     
     def toggle_pause(self):
         self.is_paused = not self.is_paused
@@ -266,27 +387,47 @@ class AudioStreamer:
     def adjust_speed(self, delta):
         self.speed_multiplier = max(0.5, min(2.0, self.speed_multiplier + delta))
     
+    def flush(self):
+        """Queue the audio the joiner is holding back for the next chunk."""
+        if self.joiner is not None:
+            tail = self.joiner.flush()
+            if len(tail):
+                self._enqueue(tail)
+
+    def stop(self):
+        """Stop playback immediately and drop any queued audio."""
+        while True:
+            try:
+                self.audio_queue.get_nowait()
+            except queue.Empty:
+                break
+        self.current_audio = None
+        self.current_mark = self.pending_mark = None
+        if self.stream:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+        self.is_playing = False
+        self.finished = True
+
     def wait_until_done(self):
+        self.flush()
+
         if not self.play_audio_flag:
             while not self.audio_queue.empty():
                 _ = self.audio_queue.get()
             return
             
-        while not self.finished or not self.audio_queue.empty():
+        # _enqueue restarts the stream whenever audio is queued, so playing
+        # stays set until everything queued has been heard
+        while self.is_playing:
             time.sleep(0.1)
-            if not self.is_playing and not self.audio_queue.empty():
-                self.stream = sd.OutputStream(
-                    samplerate=self.sample_rate,
-                    channels=1,
-                    callback=self.callback
-                )
-                self.stream.start()
-                self.is_playing = True
-        
-        if self.stream:
-            self.stream.stop()
-            self.stream.close()
-            self.is_playing = False
+
+        with self.lock:
+            stream, self.stream = self.stream, None
+        if stream:
+            stream.stop()
+            stream.close()
             
         if self.save_path and self.all_audio:
             final_audio = np.concatenate(self.all_audio)
@@ -294,32 +435,132 @@ class AudioStreamer:
             wavfile_write(self.save_path, self.sample_rate, final_audio)
 
 class InteractiveTTS:
-    def __init__(self, model, voicepack, streamer, voice='af'):
+    def __init__(self, model, voicepack, streamer, voice='af', lookahead: int = 3,
+                 history: int = 20):
         self.model = model
         self.voicepack = voicepack
         self.streamer = streamer
         self.voice = voice
         self.lang = voice[0]
+        self.lookahead = lookahead
+        self.history = history
         self.stdscr = None
-        
-    def process_text(self, text, verbose=False):
-        chunks = create_chunks(text, self.lang)
-        
-        for i, chunk in enumerate(chunks, 1):
-            if verbose:
-                print(f"\nProcessing chunk {i}/{len(chunks)}:", file=sys.stderr)
-                print(chunk, file=sys.stderr)
-            
+        self.verbose = False
+        self.sentences = []
+        self.buffer = None
+        self.lock = threading.Lock()
+        self.seek_target = None
+        self.enqueued = -1
+
+    def render_sentence(self, index: int, token: CancellationToken) -> List[np.ndarray]:
+        """Synthesize one sentence, split into chunks if it is too long."""
+        sentence = self.sentences[index]
+        if self.verbose:
+            print(f"\nProcessing sentence {index + 1}/{len(self.sentences)}:", file=sys.stderr)
+            print(sentence, file=sys.stderr)
+        audio_chunks = []
+        for chunk in create_chunks(sentence, self.lang):
+            token.raise_if_cancelled()
             audio, ps = generate(self.model, chunk, self.voicepack, self.lang, self.streamer.speed_multiplier)
             if audio is not None:
-                self.streamer.play_audio(audio)
-    
-    def handle_keyboard(self, stdscr):
+                audio_chunks.append(audio)
+        return audio_chunks
+
+    def playing(self) -> int:
+        """Index of the sentence currently heard."""
+        # Each sentence's audio is queued marked with its index
+        if self.streamer.current_mark is not None:
+            return self.streamer.current_mark
+        return max(self.enqueued, 0)
+
+    def skip(self, delta: int):
+        """Jump `delta` sentences from the current (or pending) position."""
+        with self.lock:
+            base = self.seek_target if self.seek_target is not None else self.playing()
+            self.seek_target = max(0, min(len(self.sentences) - 1, base + delta))
+
+    def process_text(self, text, verbose=False, token: Optional[CancellationToken] = None):
+        """Play sentences from the render buffer in order, honoring skips."""
+        self.verbose = verbose
+        self.sentences = split_into_sentences(text)
+        self.buffer = RenderBuffer(
+            len(self.sentences),
+            self.render_sentence,
+            ahead=self.lookahead,
+            history=self.history
+        )
+        self.buffer.start()
+        try:
+            index = 0
+            while token is None or not token.cancelled:
+                with self.lock:
+                    target, self.seek_target = self.seek_target, None
+                if target is not None:
+                    # Drop what is queued or playing and continue from the target
+                    self.streamer.stop()
+                    if self.streamer.joiner is not None:
+                        self.streamer.joiner.flush()
+                    self.enqueued = target - 1
+                    index = target
+                    self.buffer.seek(index)
+
+                if index >= len(self.sentences):
+                    # Stay around until playback ends so skipping back still works
+                    self.streamer.flush()
+                    if not self.streamer.play_audio_flag or (
+                            self.streamer.finished and self.streamer.audio_queue.empty()):
+                        return
+                    time.sleep(0.05)
+                    continue
+
+                # Keep at most one sentence queued behind the one playing:
+                # wait until the last one queued is heard (or playback ended)
+                if self.streamer.play_audio_flag and self.enqueued > self.playing() and not (
+                        self.streamer.finished and self.streamer.audio_queue.empty()):
+                    time.sleep(0.02)
+                    continue
+
+                self.buffer.seek(index)
+                audio_chunks = self.buffer.get(index, timeout=0.1)
+                if audio_chunks is None:
+                    continue
+                for audio in audio_chunks:
+                    self.streamer.play_audio(audio, mark=index)
+                self.enqueued = index
+                index += 1
+        finally:
+            self.buffer.stop()
+
+    def run(self, stdscr, text, verbose=False):
+        """Synthesize text in the background while handling keyboard controls."""
+        token = CancellationToken()
+        worker = threading.Thread(
+            target=self.process_text,
+            args=(text, verbose, token),
+            daemon=True
+        )
+        worker.start()
+        try:
+            self.handle_keyboard(stdscr, worker)
+        finally:
+            # Esc or Ctrl+C: stop generating remaining chunks and silence playback
+            token.cancel('interrupted')
+            self.streamer.stop()
+            worker.join()
+
+    def handle_keyboard(self, stdscr, worker: Optional[threading.Thread] = None):
         self.stdscr = stdscr
         curses.curs_set(0)
         stdscr.nodelay(1)
         
-        while not self.streamer.finished or not self.streamer.audio_queue.empty():
+        def active():
+            if worker is not None and worker.is_alive():
+                return True
+            if not self.streamer.play_audio_flag:
+                return False
+            return not self.streamer.finished or not self.streamer.audio_queue.empty()
+
+        while active():
             try:
                 key = stdscr.getch()
                 if key != -1:
@@ -329,6 +570,10 @@ class InteractiveTTS:
                         self.streamer.adjust_speed(-0.1)
                     elif key == curses.KEY_RIGHT:
                         self.streamer.adjust_speed(0.1)
+                    elif key in (ord('n'), curses.KEY_DOWN):
+                        self.skip(1)
+                    elif key in (ord('p'), curses.KEY_UP):
+                        self.skip(-1)
                     elif key == 27:  # ESC
                         break
                 
@@ -347,26 +592,14 @@ class InteractiveTTS:
         self.stdscr.addstr(2, 0, f"Speed: {self.streamer.speed_multiplier:.1f}x [←/→]")
         self.stdscr.addstr(3, 0, f"Voice: {self.voice}")
         self.stdscr.addstr(4, 0, f"Status: {'Paused' if self.streamer.is_paused else 'Playing'} [Space]")
-        self.stdscr.addstr(6, 0, "Press [Esc] to exit")
+        if self.sentences:
+            playing = self.playing()
+            buffered = len(self.buffer.segments) if self.buffer else 0
+            self.stdscr.addstr(5, 0, f"Sentence: {playing + 1}/{len(self.sentences)} [p/n] "
+                                     f"({buffered} buffered)")
+        self.stdscr.addstr(7, 0, "Press [Esc] to exit")
         self.stdscr.refresh()
 
-def process_text_chunks(text: str, model, voicepack, primary_voice, 
-                       streamer: AudioStreamer, speed: float, verbose: bool = False):
-    """Process text in chunks for interactive mode."""
-    chunks = create_chunks(text, primary_voice[0])
-    for chunk in chunks:
-        if verbose:
-            print(f"Processing: {chunk[:50]}...", file=sys.stderr)
-        audio, _ = generate(
-            model,
-            chunk,
-            voicepack,
-            primary_voice[0],
-            speed
-        )
-        if audio is not None:
-            streamer.play_audio(audio)
-
 def show_usage_guide():
     """Show detailed usage guide with examples and explanations."""
     print("""
@@ -399,11 +632,19 @@ Playback Controls:
   --save output.wav                     # Save to WAV file
   --no-play                             # Generate without playback
   --verbose                             # Show processing details
+  --pause-ms 300                        # Pause kept between chunks (default: 200)
+  --crossfade-ms 20                     # Crossfade at chunk joins (default: 10)
+  --no-trim                             # Keep the model's silence around chunks
+  --batch --pack optimal                # Fewest chunks for offline renders
+  --lexicon PATH                        # Phoneme cache shared across runs
+  --autotune                            # Benchmark and apply the fastest thread count
+  --no-lexicon                          # Always phonemize from scratch
 
 Interactive Mode Controls:
 -----------------------
   Space:        Pause/Resume
   Left/Right:   Adjust speed
+  n/p:          Skip to next/previous sentence
   Esc:          Exit
 
 Server/Client Usage:
@@ -423,6 +664,13 @@ Server options:
   --host HOST     Server host (default: localhost)
   --port PORT     Server port (default: 5000)
 
+Profiling:
+---------
+  --profile                             # Time hot-path functions, write flamegraph stacks
+  --profile-dir DIR                     # Output directory (default: kokoro-profile)
+  --profile-every N                     # cProfile dump for every Nth chunk/request
+  --profile-torch                       # Add torch profiler traces to the dumps
+
 Examples:
 --------
 1. Basic TTS:
@@ -440,10 +688,17 @@ Examples:
 5. Save without playing:
    cat text.txt | kokoro-tts --no-play --save output.wav
 
+6. Render a directory of .txt files (resumable):
+   kokoro-tts render chapters/ --output-dir audio/ --workers 4
+
 For more information, use: kokoro-tts --help
 """)
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'render':
+        from .render import run_render
+        return run_render(sys.argv[2:])
+
     parser = argparse.ArgumentParser(description='Kokoro TTS Streaming Tool')
     parser.add_argument('--voice', default='af',
                       help='Voice to use for TTS or mix specification (e.g., "af_bella:0.7,bf_emma:0.3")')
@@ -455,6 +710,10 @@ def main():
                       help='Show detailed progress')
     parser.add_argument('--interactive', '-i', action='store_true',
                       help='Enable interactive controls')
+    parser.add_argument('--lookahead', type=int, default=3,
+                      help='Sentences rendered ahead of playback in interactive mode (default: 3)')
+    parser.add_argument('--history', type=int, default=20,
+                      help='Played sentences kept for skipping back in interactive mode (default: 20)')
     parser.add_argument('--output-raw', action='store_true',
                       help='Output raw audio data for piping')
     parser.add_argument('--play', action='store_true', default=True,
@@ -465,49 +724,53 @@ def main():
                       help='Path to Kokoro-82M directory')
     parser.add_argument('--batch', action='store_true',
                       help='Process entire input at once (faster for wav generation, no streaming)')
+    parser.add_argument('--pack', choices=['greedy', 'optimal'], default='greedy',
+                      help='Chunk packing in batch mode: greedy (default) or optimal '
+                           '(fewest chunks, fewer inference calls)')
+    add_lexicon_arguments(parser)
+    add_postprocess_arguments(parser)
+    add_profile_arguments(parser)
+    add_autotune_arguments(parser)
     args = parser.parse_args()
+
+    global LEXICON
+    LEXICON = lexicon_from_args(args)
+
+    profiler = profiler_from_args(args)
+    if profiler:
+        # Each synthesized chunk counts as one request for --profile-every
+        profiler.install(sys.modules[__name__], requests=['generate'])
+        profiler.install(AudioStreamer, ['play_audio'], prefix='AudioStreamer.')
     
     try:
         device = 'cuda' if torch.cuda.is_available() else 'cpu'
         model = build_model(KOKORO_PATH / 'kokoro-v0_19.pth', device)
         
         # Handle voice loading with mixing support
-        if ':' in args.voice:  # Voice mix specification
-            voice_mix = {}
-            voices_dir = KOKORO_PATH / 'voices'
-            for part in args.voice.split(','):
-                name, weight = part.split(':')
-                weight = float(weight)
-                if not (voices_dir / f'{name}.pt').exists():
-                    raise FileNotFoundError(
-                        f"Voice '{name}' not found.\n"
-                        f"Available voices:\n"
-                        f"  {', '.join(v.stem for v in voices_dir.glob('*.pt'))}"
-                    )
-                voice_mix[name] = weight
-            
-            mixed_voice = sum(
-                torch.load(voices_dir / f'{name}.pt', weights_only=True).to(device) * weight
-                for name, weight in voice_mix.items()
-            )
-            voicepack = mixed_voice
-            primary_voice = max(voice_mix.items(), key=lambda x: x[1])[0]
-        else:  # Single voice
-            voice_path = KOKORO_PATH / 'voices' / f'{args.voice}.pt'
-            if not voice_path.exists():
-                raise FileNotFoundError(
-                    f"Voice '{args.voice}' not found.\n"
-                    f"Available voices:\n"
-                    f"  {', '.join(v.stem for v in (KOKORO_PATH / 'voices').glob('*.pt'))}"
+        voicepack, primary_voice = load_voice(args.voice, device)
+
+        if args.autotune or args.autotune_refresh:
+            if device == 'cpu':
+                # Chunks are synthesized one at a time, so only the thread count is tuned
+                tuning = autotune(
+                    benchmark_chunk(model, voicepack, primary_voice[0]),
+                    mode='cli',
+                    streams=1,
+                    duration=args.autotune_seconds,
+                    refresh=args.autotune_refresh
                 )
-            voicepack = torch.load(voice_path, weights_only=True).to(device)
-            primary_voice = args.voice
+                torch.set_num_threads(tuning['threads'])
+                print(f"Autotune: {describe(tuning)}", file=sys.stderr)
+            else:
+                print("Autotune skipped: only CPU inference is tuned", file=sys.stderr)
 
         # Initialize audio streamer
+        joiner_settings = joiner_settings_from_args(args)
         streamer = AudioStreamer(
             save_path=args.save,
             play_audio=args.play,
-            output_raw=args.output_raw
+            output_raw=args.output_raw,
+            joiner=None if args.batch else ChunkJoiner(**joiner_settings)
         )
         streamer.speed_multiplier = args.speed
 
@@ -516,14 +779,23 @@ def main():
             text = sys.stdin.read()
             
             if args.interactive:
-                curses.wrapper(lambda stdscr: (
-                    streamer.handle_keyboard(stdscr),
-                    process_text_chunks(text, model, voicepack, primary_voice, 
-                                     streamer, args.speed, args.verbose)
-                ))
+                interactive = InteractiveTTS(
+                    model,
+                    voicepack,
+                    streamer,
+                    primary_voice,
+                    lookahead=args.lookahead,
+                    history=args.history
+                )
+                curses.wrapper(lambda stdscr: interactive.run(stdscr, text, args.verbose))
             else:
                 # Batch processing
-                chunks = create_chunks(text, primary_voice[0])
+                if args.pack == 'optimal':
+                    chunks, stats = pack_chunks(text, primary_voice[0])
+                    if args.verbose:
+                        print(f"Packed into {stats}", file=sys.stderr)
+                else:
+                    chunks = create_chunks(text, primary_voice[0])
                 
                 if args.verbose:
                     print(f"Processing {len(chunks)} chunks in batch mode...", file=sys.stderr)
@@ -544,7 +816,8 @@ def main():
                         all_audio.append(audio)
                 
                 if all_audio:
-                    combined_audio = np.concatenate(all_audio)
+                    joiner = ChunkJoiner(**joiner_settings)
+                    combined_audio = np.concatenate(list(joiner.process(all_audio)))
                     if args.save:
                         if args.verbose:
                             print(f"Saving audio to {args.save}", file=sys.stderr)
@@ -588,6 +861,11 @@ def main():
     except Exception as e:
         print(f"\nError: {str(e)}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if LEXICON and args.verbose:
+            print(f"Phoneme lexicon: {LEXICON.hits} hits, {LEXICON.misses} misses", file=sys.stderr)
+        if profiler:
+            profiler.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
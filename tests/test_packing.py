@@ -0,0 +1,24 @@
+import pytest
+
+try:
+    from kokoro_tts_cli.packing import pack_sentences, split_pieces
+except (ImportError, FileNotFoundError) as e:
+    # The package needs torch, sounddevice and a Kokoro-82M checkout to import
+    pytest.skip(f"kokoro_tts_cli is not importable: {e}", allow_module_level=True)
+
+def count_tokens(text: str) -> int:
+    return len(text)
+
+def test_oversized_word_is_truncated_to_the_limit():
+    pieces = split_pieces(['x' * 1000], count_tokens, max_tokens=450)
+    assert len(pieces) == 1
+    text, tokens, kind = pieces[0]
+    assert tokens == count_tokens(text) <= 450
+    assert text.startswith('x') and text.endswith('...')
+    assert kind == 'sentence'
+
+def test_packed_chunks_stay_under_the_limit_with_an_oversized_word():
+    sentences = ['A short sentence.', 'Then ' + 'y' * 1000 + ' appears.', 'The end.']
+    chunks, stats = pack_sentences(sentences, count_tokens, max_tokens=450)
+    assert all(count_tokens(chunk) <= 450 for chunk in chunks)
+    assert stats.tokens <= stats.chunks * 450
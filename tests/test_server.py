@@ -0,0 +1,70 @@
+import json
+import socket
+import threading
+import time
+
+import numpy as np
+import pytest
+
+try:
+    from kokoro_tts_cli import server as server_module
+    from kokoro_tts_cli.codec import recv_frame, recv_header
+except (ImportError, FileNotFoundError) as e:
+    # The package needs torch, sounddevice and a Kokoro-82M checkout to import
+    pytest.skip(f"kokoro_tts_cli is not importable: {e}", allow_module_level=True)
+
+CHUNK_SAMPLES = 2400
+
+@pytest.fixture
+def tts_server(monkeypatch):
+    """A server on a free port whose 'model' returns a fixed tone per sentence."""
+    def generate(model, text, voicepack, lang='a', speed=1, ps=None):
+        time.sleep(0.05)  # Long enough for the client's FIN to arrive mid-stream
+        return np.full(CHUNK_SAMPLES, 0.25, dtype=np.float32), ps
+
+    monkeypatch.setattr(server_module, 'build_model', lambda *args: None)
+    monkeypatch.setattr(server_module, 'generate', generate)
+    monkeypatch.setattr(server_module, 'phonemize', lambda text, lang='a': text)
+    monkeypatch.setattr(server_module, 'create_chunks',
+                        lambda text, lang: [s.strip() for s in text.split('.') if s.strip()])
+    monkeypatch.setattr(server_module.streamer, 'LEXICON', None)
+
+    server = server_module.KokoroTTSServer(
+        port=0, workers=1,
+        joiner_settings={'trim': False, 'pause_ms': 0, 'crossfade_ms': 0}
+    )
+    server.load_voice = lambda voice_spec: (None, 'af')
+    server.bind()
+    server.port = server.server_socket.getsockname()[1]
+    threading.Thread(target=server.serve, daemon=True).start()
+    yield server
+    server.stop()
+
+def read_response(sock: socket.socket, encoding) -> bytes:
+    if encoding is None:
+        data = b''
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return data
+            data += chunk
+    recv_header(sock)
+    data = b''
+    while True:
+        frame = recv_frame(sock)
+        assert frame is not None, "stream ended without an end frame"
+        if not frame:
+            return data
+        data += frame
+
+@pytest.mark.parametrize('encoding', [None, 'float32'])
+def test_half_closed_client_receives_full_stream(tts_server, encoding):
+    request = {'text': 'One. Two. Three. Four.', 'voice': 'af'}
+    if encoding:
+        request['encoding'] = encoding
+    with socket.create_connection(('localhost', tts_server.port)) as sock:
+        sock.sendall(json.dumps(request).encode())
+        # Like `nc -N`: no more data from the client, but it keeps reading
+        sock.shutdown(socket.SHUT_WR)
+        data = read_response(sock, encoding)
+    assert len(data) == 4 * CHUNK_SAMPLES * 4